@@ -1,69 +1,216 @@
-from typing import List, Union
+from functools import lru_cache
+from typing import Iterator, List, Union
+import hashlib
 import re
+import sys
 
-class ResearchAgent:
-    def __init__(self, llm):
+
+def _text(response) -> str:
+    # Chat models return a message object; mocks and plain LLMs return a str.
+    return getattr(response, "content", response)
+
+
+# Bump whenever a prompt below changes so on-disk cached results are not reused.
+PROMPT_VERSION = 1
+
+# Static instructions come first and dynamic content last so consecutive calls
+# share the longest possible prefix for provider-side prompt caching.
+_RESEARCH_PREFIX = sys.intern("""You are a research agent. Your job is to gather comprehensive information about the topic provided at the end of this prompt.
+
+Provide detailed factual information, key concepts, and important aspects of this topic.
+Focus on accuracy and comprehensiveness.
+""")
+
+_ANALYSIS_PREFIX = sys.intern("""You are an analysis agent. Analyze the research data provided at the end of this prompt.
+
+Your task:
+1. Identify key themes and patterns
+2. Extract the most important insights
+3. Highlight any contradictions or gaps
+4. Provide critical analysis
+""")
+
+_SUMMARY_PREFIX = sys.intern("""You are a summary agent. Create a comprehensive summary report from the research data and analysis provided at the end of this prompt.
+
+Create a well-structured summary that includes:
+1. Executive Summary
+2. Key Findings
+3. Main Insights
+4. Conclusions
+5. Recommendations (if applicable)
+""")
+
+_RESEARCH_PROMPT = _RESEARCH_PREFIX + "\nTopic: {topic}\n\nResearch findings:\n"
+_ANALYSIS_PROMPT = (
+    _ANALYSIS_PREFIX + "\nResearch Data:\n{research_data}\n\nTopic: {topic}\n\nAnalysis:\n"
+)
+_SUMMARY_PROMPT = (
+    _SUMMARY_PREFIX
+    + "\nResearch Data:\n{research_data}\n\nAnalysis:\n{analysis}\n\n"
+    "Topic: {topic}\n\nFinal Report:\n"
+)
+
+
+# Prompt builders live at module level so ``self`` is not part of the cache key;
+# repeated inputs return the same (immutable) prompt string. Analysis and
+# summary inputs embed whole research texts, so they keep fewer entries.
+@lru_cache(maxsize=4096)
+def _build_research_prompt(topic: str) -> str:
+    return _RESEARCH_PROMPT.format(topic=topic)
+
+
+@lru_cache(maxsize=256)
+def _build_analysis_prompt(research_data: str, topic: str) -> str:
+    return _ANALYSIS_PROMPT.format(research_data=research_data, topic=topic)
+
+
+@lru_cache(maxsize=256)
+def _build_summary_prompt(research_data: str, analysis: str, topic: str) -> str:
+    return _SUMMARY_PROMPT.format(research_data=research_data, analysis=analysis, topic=topic)
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class BaseAgent:
+    name = "agent"
+
+    def __init__(self, llm, cache=None, caller=None, model: str = None, async_llm=None):
+        # async_llm, if given, serves the async path; with a caller it should
+        # have SDK retries disabled since the caller does the retrying.
+        if model is not None:
+            # Same client and settings, different model for this stage.
+            llm = llm.model_copy(update={"model_name": model})
+            if async_llm is not None:
+                async_llm = async_llm.model_copy(update={"model_name": model})
         self.llm = llm
-        
+        self.async_llm = async_llm or llm
+        self.cache = cache
+        self.caller = caller
+
+    def _key(self, topic: str, *upstream: str) -> tuple:
+        # Cache key: only the topic is matched semantically. Upstream inputs
+        # (research data, analysis) are matched exactly by digest, so a
+        # downstream result is never reused for different inputs.
+        return (self.name, topic, *map(_digest, upstream))
+
+    def _invoke(self, key: tuple, prompt: str) -> str:
+        if self.cache is None:
+            return _text(self.llm.invoke(prompt))
+        return self.cache.get_or_compute(key, prompt, lambda: _text(self.llm.invoke(prompt)))
+
+    async def _ainvoke(self, key: tuple, prompt: str) -> str:
+        async def compute() -> str:
+            if self.caller is None:
+                return _text(await self.async_llm.ainvoke(prompt))
+            return _text(await self.caller.call(self.async_llm.ainvoke, prompt))
+
+        if self.cache is None:
+            return await compute()
+        return await self.cache.aget_or_compute(key, prompt, compute)
+
+    def _stream(self, key: tuple, prompt: str) -> Iterator[str]:
+        if self.cache is not None:
+            cached = self.cache.get(key, prompt)
+            if cached is not None:
+                yield cached
+                return
+        parts = []
+        for chunk in self.llm.stream(prompt):
+            text = _text(chunk)
+            parts.append(text)
+            yield text
+        if self.cache is not None:
+            self.cache.put(key, prompt, "".join(parts))
+
+    def _batch(self, keys: List[tuple], prompts: List[str], max_concurrency: int) -> List[str]:
+        results = [None] * len(prompts)
+        if self.cache is not None:
+            for i, (key, prompt) in enumerate(zip(keys, prompts)):
+                results[i] = self.cache.get(key, prompt)
+        misses = [i for i, r in enumerate(results) if r is None]
+        if misses:
+            responses = self.llm.batch(
+                [prompts[i] for i in misses], config={"max_concurrency": max_concurrency}
+            )
+            for i, response in zip(misses, responses):
+                results[i] = _text(response)
+                if self.cache is not None:
+                    self.cache.put(keys[i], prompts[i], results[i])
+        return results
+
+
+class ResearchAgent(BaseAgent):
+    name = "research"
+
+    def _build_prompt(self, topic: str) -> str:
+        return _build_research_prompt(topic)
+
     def research_topic(self, topic: str) -> str:
-        prompt = f"""
-        You are a research agent. Your job is to gather comprehensive information about: {topic}
-        
-        Provide detailed factual information, key concepts, and important aspects of this topic.
-        Focus on accuracy and comprehensiveness.
-        
-        Research findings:
-        """
-        
-        response = self.llm.invoke(prompt)
-        return response
-
-class AnalysisAgent:
-    def __init__(self, llm):
-        self.llm = llm
-        
+        prompt = self._build_prompt(topic)
+        return self._invoke(self._key(topic), prompt)
+
+    async def aresearch_topic(self, topic: str) -> str:
+        prompt = self._build_prompt(topic)
+        return await self._ainvoke(self._key(topic), prompt)
+
+    def research_topic_stream(self, topic: str) -> Iterator[str]:
+        return self._stream(self._key(topic), self._build_prompt(topic))
+
+    def research_topics(self, topics: List[str], max_concurrency: int = 10) -> List[str]:
+        prompts = [self._build_prompt(t) for t in topics]
+        return self._batch([self._key(t) for t in topics], prompts, max_concurrency)
+
+
+class AnalysisAgent(BaseAgent):
+    name = "analysis"
+
+    def _build_prompt(self, research_data: str, topic: str) -> str:
+        return _build_analysis_prompt(research_data, topic)
+
     def analyze_research(self, research_data: str, topic: str) -> str:
-        prompt = f"""
-        You are an analysis agent. Analyze the following research data about "{topic}":
-        
-        Research Data:
-        {research_data}
-        
-        Your task:
-        1. Identify key themes and patterns
-        2. Extract the most important insights
-        3. Highlight any contradictions or gaps
-        4. Provide critical analysis
-        
-        Analysis:
-        """
-        
-        response = self.llm.invoke(prompt)
-        return response
-
-class SummaryAgent:
-    def __init__(self, llm):
-        self.llm = llm
-        
+        prompt = self._build_prompt(research_data, topic)
+        return self._invoke(self._key(topic, research_data), prompt)
+
+    async def aanalyze_research(self, research_data: str, topic: str) -> str:
+        prompt = self._build_prompt(research_data, topic)
+        return await self._ainvoke(self._key(topic, research_data), prompt)
+
+    def analyze_research_stream(self, research_data: str, topic: str) -> Iterator[str]:
+        return self._stream(self._key(topic, research_data),
+                            self._build_prompt(research_data, topic))
+
+    def analyze_many(self, research_data: List[str], topics: List[str],
+                     max_concurrency: int = 10) -> List[str]:
+        prompts = [self._build_prompt(r, t) for r, t in zip(research_data, topics)]
+        keys = [self._key(t, r) for r, t in zip(research_data, topics)]
+        return self._batch(keys, prompts, max_concurrency)
+
+
+class SummaryAgent(BaseAgent):
+    name = "summary"
+
+    def _build_prompt(self, research_data: str, analysis: str, topic: str) -> str:
+        return _build_summary_prompt(research_data, analysis, topic)
+
     def create_summary(self, research_data: str, analysis: str, topic: str) -> str:
-        prompt = f"""
-        You are a summary agent. Create a comprehensive summary report about "{topic}".
-        
-        Research Data:
-        {research_data}
-        
-        Analysis:
-        {analysis}
-        
-        Create a well-structured summary that includes:
-        1. Executive Summary
-        2. Key Findings
-        3. Main Insights
-        4. Conclusions
-        5. Recommendations (if applicable)
-        
-        Final Report:
-        """
-        
-        response = self.llm.invoke(prompt)
-        return response
\ No newline at end of file
+        prompt = self._build_prompt(research_data, analysis, topic)
+        return self._invoke(self._key(topic, research_data, analysis), prompt)
+
+    async def acreate_summary(self, research_data: str, analysis: str, topic: str) -> str:
+        prompt = self._build_prompt(research_data, analysis, topic)
+        return await self._ainvoke(self._key(topic, research_data, analysis), prompt)
+
+    def create_summary_stream(self, research_data: str, analysis: str,
+                              topic: str) -> Iterator[str]:
+        return self._stream(self._key(topic, research_data, analysis),
+                            self._build_prompt(research_data, analysis, topic))
+
+    def summarize_many(self, research_data: List[str], analyses: List[str],
+                       topics: List[str], max_concurrency: int = 10) -> List[str]:
+        prompts = [
+            self._build_prompt(r, a, t) for r, a, t in zip(research_data, analyses, topics)
+        ]
+        keys = [self._key(t, r, a) for r, a, t in zip(research_data, analyses, topics)]
+        return self._batch(keys, prompts, max_concurrency)
@@ -0,0 +1,50 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from openai import APIConnectionError, RateLimitError
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError)
+
+
+class AsyncCaller:
+    """Bounds concurrent LLM calls and retries transient failures.
+
+    Mirrors LangChain JS's AsyncCaller: at most ``max_concurrency`` calls are
+    in flight, and rate-limit or connection errors are retried up to
+    ``max_retries`` attempts with jittered exponential backoff so parallel
+    callers do not retry in lockstep.
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_retries: int = 6,
+                 max_backoff: float = 30):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff
+        self._loop = None
+        self._semaphore = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # A semaphore belongs to one event loop; make a new one per loop so the
+        # caller can be reused across separate asyncio.run() calls.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def call(self, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        async with self._get_semaphore():
+            async for attempt in AsyncRetrying(
+                wait=wait_random_exponential(multiplier=1, max=self.max_backoff),
+                stop=stop_after_attempt(self.max_retries),
+                retry=retry_if_exception_type(RETRYABLE_ERRORS),
+                reraise=True,
+            ):
+                with attempt:
+                    return await fn(*args, **kwargs)
@@ -0,0 +1,48 @@
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR = Path.home() / ".cache" / "agentic"
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+# The cache is best-effort: a bad or unwritable entry must never cost a run
+# whose LLM calls have already been paid for.
+
+
+def _path(key: str) -> Path:
+    return CACHE_DIR / f"{key}.json"
+
+
+def get(key: str) -> Optional[dict]:
+    try:
+        return json.loads(_path(key).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        # ValueError covers JSONDecodeError and UnicodeDecodeError.
+        _log.warning("Ignoring unreadable cache entry %s: %s", key, exc)
+        return None
+
+
+def put(key: str, value: dict) -> None:
+    tmp = None
+    try:
+        payload = json.dumps(value)
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial entry.
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp, _path(key))
+    except (OSError, TypeError, ValueError) as exc:
+        _log.warning("Could not write cache entry %s: %s", key, exc)
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,81 @@
+import argparse
+from typing import Optional
+
+import httpx
+import numpy as np
+
+from semantic_cache import EMBEDDING_MODEL
+
+SOCKET_PATH = "/tmp/embed.sock"
+
+
+def create_app(model_name: str = EMBEDDING_MODEL):
+    """Build the FastAPI app serving ``POST /embed`` from one loaded model.
+
+    The request body is ``{"texts": [...]}``; the response body is the raw
+    float32 embedding matrix, with its width in the ``X-Embedding-Dim`` header.
+    """
+    import torch
+    from fastapi import FastAPI, Response
+    from pydantic import BaseModel
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name)
+    if torch.cuda.is_available():
+        # FP16 halves memory and compute on GPUs; many CPU kernels lack it.
+        model = model.half().to("cuda")
+
+    class EmbedRequest(BaseModel):
+        texts: list[str]
+
+    app = FastAPI()
+
+    @app.post("/embed")
+    def embed(request: EmbedRequest) -> Response:
+        vectors = model.encode(request.texts, batch_size=32, convert_to_numpy=True)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        return Response(
+            content=vectors.tobytes(),
+            media_type="application/octet-stream",
+            headers={"X-Embedding-Dim": str(vectors.shape[1])},
+        )
+
+    return app
+
+
+class RemoteEmbedder:
+    """Embedding client for a running embed_server, usable as SemanticCache(embed=...).
+
+    Keeps one keep-alive connection over the Unix socket so each lookup pays
+    only for inference, not for loading the model.
+    """
+
+    def __init__(self, socket_path: str = SOCKET_PATH,
+                 transport: Optional[httpx.BaseTransport] = None):
+        self._client = httpx.Client(
+            transport=transport or httpx.HTTPTransport(uds=socket_path),
+            base_url="http://embed-server",
+        )
+
+    def embed_many(self, texts: list[str]) -> np.ndarray:
+        response = self._client.post("/embed", json={"texts": texts})
+        response.raise_for_status()
+        dim = int(response.headers["X-Embedding-Dim"])
+        return np.frombuffer(response.content, dtype=np.float32).reshape(len(texts), dim)
+
+    def __call__(self, text: str) -> np.ndarray:
+        return self.embed_many([text])[0]
+
+    def close(self):
+        self._client.close()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve sentence embeddings over a Unix socket.")
+    parser.add_argument("--socket", default=SOCKET_PATH, help=f"socket path (default: {SOCKET_PATH})")
+    parser.add_argument("--model", default=EMBEDDING_MODEL, help="sentence-transformers model name")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.model), uds=args.socket)
@@ -0,0 +1,74 @@
+import asyncio
+import atexit
+import os
+import weakref
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# One connection pool per process, shared by every ChatOpenAI handed out by
+# get_llm, so TCP/TLS sessions are reused across agents and orchestrators.
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+
+class _PerLoopTransport(httpx.AsyncBaseTransport):
+    """Async transport that keeps a separate connection pool per event loop.
+
+    Async connections belong to the loop that opened them, so a single pool
+    breaks on the second ``asyncio.run()``. Pools are keyed weakly by loop, so
+    threads running their own loops each keep a pool, and a pool is released
+    once its loop is garbage collected.
+    """
+
+    def __init__(self):
+        # event loop -> AsyncHTTPTransport
+        self._transports = weakref.WeakKeyDictionary()
+
+    def _get_transport(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        transport = self._transports.get(loop)
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(http2=True, limits=_LIMITS)
+            self._transports[loop] = transport
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._get_transport().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        # Only the current loop's pool can be closed from here.
+        transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+
+_shared_httpx = httpx.Client(http2=True, limits=_LIMITS)
+_shared_async_httpx = httpx.AsyncClient(transport=_PerLoopTransport())
+
+
+@lru_cache(maxsize=None)
+def get_llm(model: str = DEFAULT_MODEL, temperature: float = 0.7,
+            max_retries: Optional[int] = None) -> ChatOpenAI:
+    # max_retries=None keeps the OpenAI SDK's own retries; pass 0 for LLMs
+    # called through AsyncCaller so retries are not multiplied.
+    return ChatOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        temperature=temperature,
+        model=model,
+        max_retries=max_retries,
+        http_client=_shared_httpx,
+        http_async_client=_shared_async_httpx,
+    )
+
+
+def _close_clients():
+    # Only the sync pool can still be closed at exit; async pools died with
+    # the event loops that owned them.
+    _shared_httpx.close()
+
+
+atexit.register(_close_clients)
@@ -1,31 +1,199 @@
-import os
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import io
+import logging
+import re
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from agents import ResearchAgent, AnalysisAgent, SummaryAgent
+import disk_cache
+from agents import PROMPT_VERSION, ResearchAgent, AnalysisAgent, SummaryAgent
+from async_caller import AsyncCaller
+from llm_client import DEFAULT_MODEL, get_llm
 
 load_dotenv()
 
+# Library code only logs; applications decide where (and whether) it goes.
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+_SEP = "=" * 50
+_FNAME_SAFE = re.compile(r"[^A-Za-z0-9._-]+")
+_BINARY_FORMATS = ("json", "mpk")
+
+# Stages not listed here run on DEFAULT_MODEL. Empty by default so every stage
+# stays on the cheap model; larger models are opt-in via stage_models.
+STAGE_MODELS: dict = {}
+
+@dataclass
+class PipelineStep:
+    # fn is awaited with ``topic`` plus the outputs of ``depends_on`` as keyword
+    # arguments; its result is stored in the pipeline results under ``name``.
+    name: str
+    fn: Callable[..., Awaitable[str]]
+    depends_on: tuple[str, ...] = ()
+
+
+def _layers(steps: list[PipelineStep]) -> list[list[PipelineStep]]:
+    resolved = {"topic"}
+    pending = list(steps)
+    layers = []
+    while pending:
+        layer = [s for s in pending if all(d in resolved for d in s.depends_on)]
+        if not layer:
+            names = ", ".join(s.name for s in pending)
+            raise ValueError(f"Unresolvable pipeline dependencies for: {names}")
+        layers.append(layer)
+        resolved.update(s.name for s in layer)
+        done = {id(s) for s in layer}
+        pending = [s for s in pending if id(s) not in done]
+    return layers
+
+
+async def _run_layer(coros: list) -> list:
+    if sys.version_info >= (3, 11):
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(c) for c in coros]
+        except ExceptionGroup as eg:
+            # Raise the first failure like gather does, so callers can catch
+            # e.g. openai.RateLimitError on every Python version.
+            raise eg.exceptions[0] from None
+        return [t.result() for t in tasks]
+    return await asyncio.gather(*coros)
+
+
+def _format_report(results: dict) -> str:
+    return "".join([
+        f"RESEARCH REPORT: {results['topic']}\n",
+        _SEP, "\n\n",
+        "RESEARCH DATA:\n",
+        results['research_data'],
+        "\n\n", _SEP, "\n\n",
+        "ANALYSIS:\n",
+        results['analysis'],
+        "\n\n", _SEP, "\n\n",
+        "FINAL SUMMARY:\n",
+        results['final_summary'],
+    ])
+
+
+def _do_save(results: dict, filename: str):
+    payload = _format_report(results)
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(payload)
+
+    _log.info("Results saved to %s", filename)
+
+
+def _binary_serializer(fmt: str) -> Callable[[dict], bytes]:
+    if fmt == "json":
+        import orjson
+        return lambda results: orjson.dumps(results, option=orjson.OPT_INDENT_2)
+    import msgpack
+    return msgpack.packb
+
+
+def _do_save_binary(results: dict, path: str, dumps: Callable[[dict], bytes]):
+    Path(path).write_bytes(dumps(results))
+
+    _log.info("Results saved to %s", path)
+
+
+def _default_filename(topic: str, ext: str) -> str:
+    slug = _FNAME_SAFE.sub("_", topic).strip("_")[:120]
+    return f"research_report_{slug}.{ext}"
+
+
 class MultiAgentOrchestrator:
-    def __init__(self):
-        self.llm = ChatOpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            temperature=0.7,
-            model="gpt-3.5-turbo"
-        )
-        self.research_agent = ResearchAgent(self.llm)
-        self.analysis_agent = AnalysisAgent(self.llm)
-        self.summary_agent = SummaryAgent(self.llm)
+    def __init__(self, max_concurrency: int = 10, cache=None, llm=None,
+                 stage_models: dict = None, use_disk_cache: bool = False):
+        # Passing llm runs every stage on that one model (handy for tests);
+        # otherwise each stage gets the model named in stage_models.
+        if llm is not None:
+            stage_llms = dict.fromkeys(("research", "analysis", "summary"), llm)
+            async_llms = stage_llms
+        else:
+            models = STAGE_MODELS if stage_models is None else stage_models
+            stage_llms = {
+                stage: get_llm(model=models.get(stage, DEFAULT_MODEL), temperature=0.7)
+                for stage in ("research", "analysis", "summary")
+            }
+            # The async path retries in AsyncCaller, so the SDK must not retry
+            # as well; otherwise each attempt fans out into several requests.
+            async_llms = {
+                stage: get_llm(model=models.get(stage, DEFAULT_MODEL), temperature=0.7,
+                               max_retries=0)
+                for stage in ("research", "analysis", "summary")
+            }
+        self.llm = stage_llms["research"]
+        # Async LLM calls share one caller so the concurrency cap and retry
+        # backoff apply across every pipeline this orchestrator runs.
+        self.caller = AsyncCaller(max_concurrency=max_concurrency)
+        # cache: optional semantic_cache.SemanticCache shared by all agents
+        self.research_agent = ResearchAgent(stage_llms["research"], cache=cache, caller=self.caller,
+                                            async_llm=async_llms["research"])
+        self.analysis_agent = AnalysisAgent(stage_llms["analysis"], cache=cache, caller=self.caller,
+                                            async_llm=async_llms["analysis"])
+        self.summary_agent = SummaryAgent(stage_llms["summary"], cache=cache, caller=self.caller,
+                                          async_llm=async_llms["summary"])
+        self.max_concurrency = max_concurrency
+        self.use_disk_cache = use_disk_cache
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="orc-io")
+        # Agent methods are looked up at call time so agents can be swapped out.
+        self.steps = [
+            PipelineStep(
+                "research_data",
+                lambda **kw: self.research_agent.aresearch_topic(**kw),
+            ),
+            PipelineStep(
+                "analysis",
+                lambda **kw: self.analysis_agent.aanalyze_research(**kw),
+                depends_on=("research_data",),
+            ),
+            PipelineStep(
+                "final_summary",
+                lambda **kw: self.summary_agent.acreate_summary(**kw),
+                depends_on=("research_data", "analysis"),
+            ),
+        ]
     
-    def run_research_pipeline(self, topic: str) -> dict:
-        print(f"🔍 Starting research pipeline for: {topic}")
+    def _disk_cache_key(self, topic: str) -> str:
+        models = ",".join(
+            str(agent.llm.model_name)
+            for agent in (self.research_agent, self.analysis_agent, self.summary_agent)
+        )
+        return hashlib.blake2b(f"{topic}|{models}|{PROMPT_VERSION}".encode()).hexdigest()
+
+    def _cached_results(self, topic: str, force_refresh: bool):
+        if not self.use_disk_cache or force_refresh:
+            return None
+        return disk_cache.get(self._disk_cache_key(topic))
+
+    def _cache_results(self, results: dict):
+        if self.use_disk_cache:
+            disk_cache.put(self._disk_cache_key(results["topic"]), results)
+
+    def run_research_pipeline(self, topic: str, force_refresh: bool = False) -> dict:
+        cached = self._cached_results(topic, force_refresh)
+        if cached is not None:
+            _log.info("Using cached results for %s", topic)
+            return cached
+
+        _log.info("Starting research pipeline for %s", topic)
         
-        print("\n📊 Research Agent working...")
+        _log.info("Stage %s starting for %s", "research", topic)
         research_data = self.research_agent.research_topic(topic)
         
-        print("🧠 Analysis Agent working...")
+        _log.info("Stage %s starting for %s", "analysis", topic)
         analysis = self.analysis_agent.analyze_research(research_data, topic)
         
-        print("📝 Summary Agent working...")
+        _log.info("Stage %s starting for %s", "summary", topic)
         summary = self.summary_agent.create_summary(research_data, analysis, topic)
         
         results = {
@@ -35,38 +203,168 @@ class MultiAgentOrchestrator:
             "final_summary": summary
         }
         
-        print("✅ Pipeline completed!")
+        self._cache_results(results)
+        _log.info("Pipeline completed for %s", topic)
+        return results
+    
+    def stream_research_pipeline(self, topic: str, filename: str = None, out=None,
+                                 force_refresh: bool = False) -> dict:
+        # Chunks go to ``out`` (stdout by default) and, when given, to ``filename``
+        # in the save_results report format as soon as they arrive.
+        out = out or sys.stdout
+        cached = self._cached_results(topic, force_refresh)
+        if cached is not None:
+            report = _format_report(cached)
+            out.write(report + "\n")
+            out.flush()
+            if filename:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    f.write(report)
+            return cached
+
+        opener = open(filename, 'w', encoding='utf-8') if filename else contextlib.nullcontext()
+        with opener as f:
+            def emit(text: str):
+                out.write(text)
+                if f is not None:
+                    f.write(text)
+
+            emit(f"RESEARCH REPORT: {topic}\n{_SEP}\n\n")
+            research_data = self._stream_stage(
+                emit, "RESEARCH DATA:\n", self.research_agent.research_topic_stream(topic)
+            )
+            emit(f"\n\n{_SEP}\n\n")
+            analysis = self._stream_stage(
+                emit, "ANALYSIS:\n",
+                self.analysis_agent.analyze_research_stream(research_data, topic)
+            )
+            emit(f"\n\n{_SEP}\n\n")
+            summary = self._stream_stage(
+                emit, "FINAL SUMMARY:\n",
+                self.summary_agent.create_summary_stream(research_data, analysis, topic)
+            )
+        out.write("\n")
+        out.flush()
+
+        results = {
+            "topic": topic,
+            "research_data": research_data,
+            "analysis": analysis,
+            "final_summary": summary
+        }
+        self._cache_results(results)
+        return results
+
+    @staticmethod
+    def _stream_stage(emit: Callable[[str], None], heading: str, chunks: Iterator[str]) -> str:
+        emit(heading)
+        buf = io.StringIO()
+        for chunk in chunks:
+            emit(chunk)
+            buf.write(chunk)
+        return buf.getvalue()
+
+    def run_batch(self, topics: list[str]) -> list[dict]:
+        _log.info("Starting batch pipeline for %d topics", len(topics))
+
+        _log.info("Stage %s starting for %d topics", "research", len(topics))
+        research_data = self.research_agent.research_topics(topics, self.max_concurrency)
+
+        _log.info("Stage %s starting for %d topics", "analysis", len(topics))
+        analyses = self.analysis_agent.analyze_many(research_data, topics, self.max_concurrency)
+
+        _log.info("Stage %s starting for %d topics", "summary", len(topics))
+        summaries = self.summary_agent.summarize_many(
+            research_data, analyses, topics, self.max_concurrency
+        )
+
+        _log.info("Batch pipeline completed for %d topics", len(topics))
+        return [
+            {
+                "topic": topic,
+                "research_data": r,
+                "analysis": a,
+                "final_summary": s
+            }
+            for topic, r, a, s in zip(topics, research_data, analyses, summaries)
+        ]
+
+    async def arun_research_pipeline(self, topic: str) -> dict:
+        _log.info("Starting research pipeline for %s", topic)
+
+        results = {"topic": topic}
+        for layer in _layers(self.steps):
+            _log.info("Stage %s starting for %s", ", ".join(step.name for step in layer), topic)
+            outputs = await _run_layer([
+                step.fn(topic=topic, **{d: results[d] for d in step.depends_on})
+                for step in layer
+            ])
+            results.update(zip((step.name for step in layer), outputs))
+
+        _log.info("Pipeline completed for %s", topic)
         return results
+
+    async def arun_many(self, topics: list[str]) -> list[dict]:
+        # Created per call so the semaphore binds to the running event loop.
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(topic: str) -> dict:
+            async with semaphore:
+                return await self.arun_research_pipeline(topic)
+
+        return await asyncio.gather(*(bounded(t) for t in topics))
     
-    def save_results(self, results: dict, filename: str = None):
+    def save_results(self, results: dict, filename: str = None) -> Future:
         if filename is None:
-            filename = f"research_report_{results['topic'].replace(' ', '_')}.txt"
-        
-        with open(filename, 'w') as f:
-            f.write(f"RESEARCH REPORT: {results['topic']}\n")
-            f.write("=" * 50 + "\n\n")
-            f.write("RESEARCH DATA:\n")
-            f.write(results['research_data'])
-            f.write("\n\n" + "=" * 50 + "\n\n")
-            f.write("ANALYSIS:\n")
-            f.write(results['analysis'])
-            f.write("\n\n" + "=" * 50 + "\n\n")
-            f.write("FINAL SUMMARY:\n")
-            f.write(results['final_summary'])
-        
-        print(f"💾 Results saved to {filename}")
+            filename = _default_filename(results['topic'], "txt")
+
+        # The write happens on the I/O pool; call .result() to wait for it and
+        # to see any error it raised.
+        return self._io_pool.submit(_do_save, results, filename)
+
+    def save_results_binary(self, results: dict, path: str = None, fmt: str = None) -> Future:
+        # Compact machine-readable alternative to save_results for bulk runs:
+        # "json" uses orjson, "mpk" uses msgpack. Both are optional dependencies.
+        # The format defaults to the path's extension, or json without a path.
+        if fmt is None:
+            fmt = Path(path).suffix.lstrip(".") if path else "json"
+        if fmt not in _BINARY_FORMATS:
+            raise ValueError(f"Unsupported binary format: {fmt!r}")
+        # Import here so a missing serializer raises ImportError to the caller
+        # instead of failing on the I/O thread.
+        dumps = _binary_serializer(fmt)
+        if path is None:
+            path = _default_filename(results['topic'], fmt)
+        return self._io_pool.submit(_do_save_binary, results, path, dumps)
+
+    def close(self):
+        self._io_pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
 if __name__ == "__main__":
-    orchestrator = MultiAgentOrchestrator()
-    
-    topic = input("Enter a research topic: ")
-    results = orchestrator.run_research_pipeline(topic)
-    
-    print("\n" + "=" * 60)
-    print("FINAL SUMMARY:")
-    print("=" * 60)
-    print(results['final_summary'])
-    
-    save_option = input("\nSave full report to file? (y/n): ")
-    if save_option.lower() == 'y':
-        orchestrator.save_results(results)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the multi-agent research pipeline.")
+    parser.add_argument("--format", choices=["txt", "json", "mpk"], default="txt",
+                        help="file format for the saved report (default: txt)")
+    args = parser.parse_args()
+    # Progress from this module only (named __main__ when run as a script);
+    # INFO from httpx etc. would interleave with the streamed report.
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    _log.setLevel(logging.INFO)
+
+    with MultiAgentOrchestrator(use_disk_cache=True) as orchestrator:
+        topic = input("Enter a research topic: ")
+        print()
+        results = orchestrator.stream_research_pipeline(topic)
+
+        save_option = input("\nSave full report to file? (y/n): ")
+        if save_option.lower() == 'y':
+            if args.format == "txt":
+                saved = orchestrator.save_results(results)
+            else:
+                saved = orchestrator.save_results_binary(results, fmt=args.format)
+            saved.result()
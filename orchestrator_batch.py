@@ -0,0 +1,134 @@
+import json
+import logging
+import os
+import time
+from openai import OpenAI
+from orchestrator import MultiAgentOrchestrator
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchOrchestrator(MultiAgentOrchestrator):
+    """Runs the research pipeline through OpenAI's asynchronous Batch API.
+
+    Batch requests are billed at half price but may take up to 24 hours, so
+    this is meant for large topic sweeps rather than interactive use. Each
+    stage depends on the previous one, so research, analysis and summary are
+    submitted as three sequential batches.
+    """
+
+    def __init__(self, client: OpenAI = None, **kwargs):
+        super().__init__(**kwargs)
+        self.client = client or OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+    def run_batch_offline(self, topics: list[str], poll_interval: float = 30) -> list[dict]:
+        if not topics:
+            # The Batch API rejects an empty input file.
+            return []
+        _log.info("Starting offline batch pipeline for %d topics", len(topics))
+
+        _log.info("Stage %s submitting batch for %d topics", "research", len(topics))
+        research_data = self._run_stage(
+            "research", self.research_agent,
+            [self.research_agent._build_prompt(t) for t in topics],
+            poll_interval,
+        )
+
+        _log.info("Stage %s submitting batch for %d topics", "analysis", len(topics))
+        analyses = self._run_stage(
+            "analysis", self.analysis_agent,
+            [self.analysis_agent._build_prompt(r, t) for r, t in zip(research_data, topics)],
+            poll_interval,
+        )
+
+        _log.info("Stage %s submitting batch for %d topics", "summary", len(topics))
+        summaries = self._run_stage(
+            "summary", self.summary_agent,
+            [
+                self.summary_agent._build_prompt(r, a, t)
+                for r, a, t in zip(research_data, analyses, topics)
+            ],
+            poll_interval,
+        )
+
+        _log.info("Offline batch pipeline completed for %d topics", len(topics))
+        return [
+            {
+                "topic": topic,
+                "research_data": r,
+                "analysis": a,
+                "final_summary": s
+            }
+            for topic, r, a, s in zip(topics, research_data, analyses, summaries)
+        ]
+
+    def _run_stage(self, stage: str, agent, prompts: list[str], poll_interval: float) -> list[str]:
+        lines = [
+            json.dumps({
+                "custom_id": f"{i}:{stage}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": agent.llm.model_name,
+                    "temperature": agent.llm.temperature,
+                    "messages": [{"role": "user", "content": prompt}],
+                },
+            })
+            for i, prompt in enumerate(prompts)
+        ]
+        batch_file = self.client.files.create(
+            file=("requests.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        while batch.status not in _TERMINAL_STATUSES:
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} for stage '{stage}' ended as {batch.status}")
+
+        return self._parse_output(stage, batch, len(prompts))
+
+    def _parse_output(self, stage: str, batch, count: int) -> list[str]:
+        outputs = {}
+        if batch.output_file_id:
+            for line in self.client.files.content(batch.output_file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                response = record.get("response") or {}
+                if record.get("error") or response.get("status_code") != 200:
+                    continue
+                outputs[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+
+        missing = [i for i in range(count) if f"{i}:{stage}" not in outputs]
+        if missing:
+            raise RuntimeError(
+                f"Batch {batch.id} for stage '{stage}' has no result for requests {missing}"
+            )
+        return [outputs[f"{i}:{stage}"] for i in range(count)]
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Progress from the orchestrators only (this module is __main__ when run as
+    # a script); INFO from httpx etc. would drown it out.
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logging.getLogger("orchestrator").setLevel(logging.INFO)
+    _log.setLevel(logging.INFO)
+    with open(sys.argv[1]) as f:
+        topics = [line.strip() for line in f if line.strip()]
+
+    with BatchOrchestrator() as orchestrator:
+        saves = [orchestrator.save_results(results)
+                 for results in orchestrator.run_batch_offline(topics)]
+        for saved in saves:
+            saved.result()
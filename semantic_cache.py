@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+import numpy as np
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+_model = None
+
+
+def _default_embed(text: str) -> np.ndarray:
+    # With AGENTIC_EMBED_SOCKET set, embed via a long-running embed_server
+    # instead of loading the model into this process.
+    global _model
+    if _model is None:
+        socket_path = os.getenv("AGENTIC_EMBED_SOCKET")
+        if socket_path:
+            from embed_server import RemoteEmbedder
+            _model = RemoteEmbedder(socket_path)
+        else:
+            # sentence-transformers pulls in torch, so only load it on first use.
+            from sentence_transformers import SentenceTransformer
+            st_model = SentenceTransformer(EMBEDDING_MODEL)
+            _model = lambda t: st_model.encode(t, convert_to_numpy=True)
+    return _model(text)
+
+
+def _quantize(v: np.ndarray) -> tuple[np.ndarray, np.float32]:
+    # Symmetric per-vector int8 quantization: v ~= q * scale / 127.
+    scale = np.float32(np.abs(v).max()) or np.float32(1.0)
+    return np.round(v * (127 / scale)).astype(np.int8), scale
+
+
+def _prompt_hash(prompt: str) -> str:
+    return hashlib.blake2b(prompt.encode("utf-8")).hexdigest()
+
+
+def _scope_id(key: tuple) -> int:
+    # Everything in the key except the topic must match exactly for a
+    # semantic hit: the agent name plus any upstream-input digests.
+    scope = "\0".join((key[0], *key[2:])).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(scope, digest_size=8).digest(), "little", signed=True)
+
+
+class SemanticCache:
+    """LRU cache of LLM responses keyed by (agent_name, topic, *context).
+
+    Identical prompts are served from an exact-match table without embedding
+    anything. Otherwise the topic is embedded and compared against cached
+    topics with the same agent and context; a cosine similarity of at least
+    ``threshold`` counts as a hit, so paraphrased topics reuse earlier
+    responses. Agents whose output depends on more than the topic put a digest
+    of those inputs in ``context``.
+    """
+
+    def __init__(self, threshold: float = 0.87, maxsize: int = 1024,
+                 embed: Optional[Callable[[str], np.ndarray]] = None):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._embed = embed or _default_embed
+        self._exact: "OrderedDict[str, str]" = OrderedDict()
+        # Semantic entries live in rows [0, _n) of one contiguous matrix of
+        # int8-quantized unit vectors (a quarter of the float32 footprint)
+        # with one float32 scale per row, so a lookup is a single E @ q. Rows
+        # are reused in place on eviction; the matrix grows by doubling.
+        self._E_i8 = np.empty((0, 0), dtype=np.int8)
+        self._scale = np.empty(0, dtype=np.float32)
+        self._n = 0
+        self._scope_ids = np.empty(0, dtype=np.int64)
+        self._last_used = np.empty(0, dtype=np.int64)
+        self._values: list = []
+        self._clock = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def _query(self, topic: str) -> np.ndarray:
+        q = np.asarray(self._embed(topic), dtype=np.float32)
+        norm = np.linalg.norm(q)
+        return q / norm if norm else q
+
+    def get(self, key: tuple, prompt: str):
+        value = self._get_exact(prompt)
+        if value is not None:
+            return value
+        scope_id = _scope_id(key)
+        if not (self._scope_ids[:self._n] == scope_id).any():
+            return None
+        return self._get_similar(scope_id, self._query(key[1]))
+
+    def _get_exact(self, prompt: str):
+        digest = _prompt_hash(prompt)
+        if digest in self._exact:
+            self._exact.move_to_end(digest)
+            return self._exact[digest]
+        return None
+
+    def _get_similar(self, scope_id: int, q: np.ndarray):
+        if not self._n:
+            return None
+        q_i8, q_scale = _quantize(q)
+        n = self._n
+        dots = np.matmul(self._E_i8[:n], q_i8, dtype=np.int32)
+        sims = dots.astype(np.float32) * (self._scale[:n] * (q_scale / (127 * 127)))
+        sims[self._scope_ids[:n] != scope_id] = -np.inf
+        idx = int(sims.argmax())
+        if sims[idx] < self.threshold:
+            return None
+        self._last_used[idx] = self._tick()
+        return self._values[idx]
+
+    def put(self, key: tuple, prompt: str, value: str,
+            q: Optional[np.ndarray] = None) -> None:
+        # ``q`` is the normalized topic vector from _query, if already computed.
+        self._exact[_prompt_hash(prompt)] = value
+        if len(self._exact) > self.maxsize:
+            self._exact.popitem(last=False)
+
+        if q is None:
+            q = self._query(key[1])
+        if self._n >= self.maxsize:
+            idx = int(self._last_used[:self._n].argmin())
+            self._values[idx] = value
+        else:
+            if self._n == len(self._E_i8):
+                self._grow(q.shape[0])
+            idx = self._n
+            self._n += 1
+            self._values.append(value)
+        self._E_i8[idx], self._scale[idx] = _quantize(q)
+        self._scope_ids[idx] = _scope_id(key)
+        self._last_used[idx] = self._tick()
+
+    def _grow(self, dim: int) -> None:
+        capacity = min(max(2 * len(self._E_i8), 16), self.maxsize)
+        E_i8 = np.empty((capacity, dim), dtype=np.int8)
+        if self._n:
+            E_i8[:self._n] = self._E_i8[:self._n]
+        self._E_i8 = E_i8
+        self._scale = np.resize(self._scale, capacity)
+        self._scope_ids = np.resize(self._scope_ids, capacity)
+        self._last_used = np.resize(self._last_used, capacity)
+
+    def get_or_compute(self, key: tuple, prompt: str,
+                       compute: Callable[[], str]) -> str:
+        value = self._get_exact(prompt)
+        if value is not None:
+            return value
+        # Embed once and reuse the vector for both the lookup and the insert.
+        q = self._query(key[1])
+        value = self._get_similar(_scope_id(key), q)
+        if value is None:
+            value = compute()
+            self.put(key, prompt, value, q)
+        return value
+
+    async def aget_or_compute(self, key: tuple, prompt: str,
+                              compute: Callable[[], Awaitable[str]]) -> str:
+        value = self._get_exact(prompt)
+        if value is not None:
+            return value
+        # Embedding is blocking model inference; keep it off the event loop.
+        q = await asyncio.to_thread(self._query, key[1])
+        value = self._get_similar(_scope_id(key), q)
+        if value is None:
+            value = await compute()
+            self.put(key, prompt, value, q)
+        return value
@@ -1,6 +1,7 @@
+import asyncio
 import pytest
-from unittest.mock import Mock, MagicMock
-from agents import ResearchAgent, AnalysisAgent, SummaryAgent
+from unittest.mock import AsyncMock, Mock, MagicMock
+from agents import ResearchAgent, AnalysisAgent, SummaryAgent, _digest
 
 
 class TestResearchAgent:
@@ -23,6 +24,13 @@ class TestResearchAgent:
         agent = ResearchAgent(mock_llm)
         assert agent.llm == mock_llm
 
+    def test_init_with_model_override(self, mock_llm):
+        """Test that a stage-specific model copies the LLM with a new model name."""
+        agent = ResearchAgent(mock_llm, model="gpt-4o")
+
+        mock_llm.model_copy.assert_called_once_with(update={"model_name": "gpt-4o"})
+        assert agent.llm is mock_llm.model_copy.return_value
+
     def test_research_topic_basic(self, research_agent, mock_llm):
         """Test basic research_topic functionality."""
         topic = "artificial intelligence"
@@ -44,6 +52,24 @@ class TestResearchAgent:
         assert topic in call_args
         assert "research agent" in call_args.lower()
 
+    def test_research_prompt_has_topic_independent_prefix(self, research_agent, mock_llm):
+        """Test that only the tail of the prompt varies with the topic."""
+        research_agent.research_topic("topic one")
+        research_agent.research_topic("topic two")
+
+        first, second = (call[0][0] for call in mock_llm.invoke.call_args_list)
+        prefix = first[:first.index("topic one")]
+        assert second.startswith(prefix)
+        assert "research agent" in prefix.lower()
+
+    def test_repeated_topic_reuses_prompt_string(self, research_agent, mock_llm):
+        """Test that the same topic yields the identical memoized prompt object."""
+        research_agent.research_topic("repeated topic")
+        research_agent.research_topic("repeated topic")
+
+        first, second = (call[0][0] for call in mock_llm.invoke.call_args_list)
+        assert first is second
+
     def test_research_topic_with_special_characters(self, research_agent, mock_llm):
         """Test research with special characters in topic."""
         topic = "AI & ML: Future & Trends"
@@ -60,6 +86,60 @@ class TestResearchAgent:
         assert result == "Mocked research response"
         mock_llm.invoke.assert_called_once()
 
+    def test_research_topic_returns_message_content(self, research_agent, mock_llm):
+        """Test that chat message responses are unwrapped to their text."""
+        mock_llm.invoke.return_value = Mock(content="Message content")
+
+        assert research_agent.research_topic("AI") == "Message content"
+
+    def test_aresearch_topic_goes_through_caller(self, mock_llm):
+        """Test that async calls are routed through the retrying caller."""
+        mock_llm.ainvoke = AsyncMock()
+        caller = Mock()
+        caller.call = AsyncMock(return_value="Called response")
+        agent = ResearchAgent(mock_llm, caller=caller)
+
+        result = asyncio.run(agent.aresearch_topic("AI"))
+
+        assert result == "Called response"
+        fn, prompt = caller.call.call_args[0]
+        assert fn is mock_llm.ainvoke
+        assert "AI" in prompt
+
+    def test_research_topic_stream_yields_chunk_text(self, research_agent, mock_llm):
+        """Test that streamed message chunks are yielded as text."""
+        mock_llm.stream = Mock(return_value=iter([Mock(content="Hello "), Mock(content="world")]))
+
+        chunks = list(research_agent.research_topic_stream("AI"))
+
+        assert chunks == ["Hello ", "world"]
+        assert "AI" in mock_llm.stream.call_args[0][0]
+        mock_llm.invoke.assert_not_called()
+
+    def test_research_topics_uses_single_batch_call(self, research_agent, mock_llm):
+        """Test that multiple topics are sent through one llm.batch call."""
+        mock_llm.batch = Mock(return_value=["R1", "R2"])
+
+        result = research_agent.research_topics(["AI", "ML"], max_concurrency=4)
+
+        assert result == ["R1", "R2"]
+        mock_llm.batch.assert_called_once()
+        prompts = mock_llm.batch.call_args[0][0]
+        assert "AI" in prompts[0] and "ML" in prompts[1]
+        assert mock_llm.batch.call_args[1]['config'] == {"max_concurrency": 4}
+        mock_llm.invoke.assert_not_called()
+
+    def test_aresearch_topic(self, research_agent, mock_llm):
+        """Test the async research path awaits ainvoke with the same prompt."""
+        mock_llm.ainvoke = AsyncMock(return_value="Async research response")
+
+        result = asyncio.run(research_agent.aresearch_topic("quantum computing"))
+
+        assert result == "Async research response"
+        mock_llm.ainvoke.assert_awaited_once()
+        assert "quantum computing" in mock_llm.ainvoke.call_args[0][0]
+        mock_llm.invoke.assert_not_called()
+
 
 class TestAnalysisAgent:
     """Test suite for AnalysisAgent class."""
@@ -107,6 +187,17 @@ class TestAnalysisAgent:
         assert topic in call_args
         assert "analysis agent" in call_args.lower()
 
+    def test_analyze_research_with_braces_in_data(self, analysis_agent, mock_llm):
+        """Test that template placeholders in the inputs are passed through verbatim."""
+        research_data = "JSON example: {\"key\": \"{value}\"}"
+        topic = "{topic}"
+
+        analysis_agent.analyze_research(research_data, topic)
+
+        call_args = mock_llm.invoke.call_args[0][0]
+        assert research_data in call_args
+        assert "Topic: {topic}" in call_args
+
     def test_analyze_research_with_long_data(self, analysis_agent, mock_llm):
         """Test analysis with long research data."""
         research_data = "A" * 10000  # Very long research data
@@ -127,6 +218,35 @@ class TestAnalysisAgent:
         assert result == "Mocked analysis response"
         mock_llm.invoke.assert_called_once()
 
+    def test_analyze_research_stream(self, analysis_agent, mock_llm):
+        """Test that the analysis stream prompt includes the research data."""
+        mock_llm.stream = Mock(return_value=iter(["A", "B"]))
+
+        assert list(analysis_agent.analyze_research_stream("Data", "topic")) == ["A", "B"]
+        assert "Data" in mock_llm.stream.call_args[0][0]
+
+    def test_analyze_many(self, analysis_agent, mock_llm):
+        """Test that research data and topics are zipped into batch prompts."""
+        mock_llm.batch = Mock(return_value=["A1", "A2"])
+
+        result = analysis_agent.analyze_many(["data one", "data two"], ["t1", "t2"])
+
+        assert result == ["A1", "A2"]
+        prompts = mock_llm.batch.call_args[0][0]
+        assert "data one" in prompts[0] and "t1" in prompts[0]
+        assert "data two" in prompts[1] and "t2" in prompts[1]
+
+    def test_aanalyze_research(self, analysis_agent, mock_llm):
+        """Test the async analysis path."""
+        mock_llm.ainvoke = AsyncMock(return_value="Async analysis response")
+
+        result = asyncio.run(analysis_agent.aanalyze_research("Data", "topic"))
+
+        assert result == "Async analysis response"
+        call_args = mock_llm.ainvoke.call_args[0][0]
+        assert "Data" in call_args
+        assert "topic" in call_args
+
 
 class TestSummaryAgent:
     """Test suite for SummaryAgent class."""
@@ -206,6 +326,127 @@ class TestSummaryAgent:
         assert result == "Mocked summary response"
         mock_llm.invoke.assert_called_once()
 
+    def test_create_summary_stream(self, summary_agent, mock_llm):
+        """Test that the summary stream prompt includes all inputs."""
+        mock_llm.stream = Mock(return_value=iter(["S"]))
+
+        assert list(summary_agent.create_summary_stream("R", "A", "topic")) == ["S"]
+        call_args = mock_llm.stream.call_args[0][0]
+        assert all(x in call_args for x in ("R", "A", "topic"))
+
+    def test_summarize_many(self, summary_agent, mock_llm):
+        """Test that research, analysis and topic are zipped into batch prompts."""
+        mock_llm.batch = Mock(return_value=["S1", "S2"])
+
+        result = summary_agent.summarize_many(["r1", "r2"], ["a1", "a2"], ["t1", "t2"])
+
+        assert result == ["S1", "S2"]
+        prompts = mock_llm.batch.call_args[0][0]
+        assert all(x in prompts[1] for x in ("r2", "a2", "t2"))
+
+    def test_acreate_summary(self, summary_agent, mock_llm):
+        """Test the async summary path."""
+        mock_llm.ainvoke = AsyncMock(return_value="Async summary response")
+
+        result = asyncio.run(summary_agent.acreate_summary("R", "A", "topic"))
+
+        assert result == "Async summary response"
+        mock_llm.ainvoke.assert_awaited_once()
+
+
+class TestAgentCache:
+    """Test suite for agents sharing a response cache."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a cache that misses until something is stored."""
+        store = {}
+
+        def get_or_compute(key, prompt, compute):
+            if key not in store:
+                store[key] = compute()
+            return store[key]
+
+        cache = Mock()
+        cache.get_or_compute = Mock(side_effect=get_or_compute)
+        return cache
+
+    def test_cache_hit_skips_llm(self, cache):
+        """Test that a repeated topic is served from the cache."""
+        llm = Mock()
+        llm.invoke = Mock(return_value="Research response")
+        agent = ResearchAgent(llm, cache=cache)
+
+        assert agent.research_topic("AI") == "Research response"
+        assert agent.research_topic("AI") == "Research response"
+
+        llm.invoke.assert_called_once()
+
+    def test_cache_key_includes_agent_name(self, cache):
+        """Test that cache keys are namespaced by agent."""
+        llm = Mock()
+        llm.invoke = Mock(return_value="response")
+
+        ResearchAgent(llm, cache=cache).research_topic("AI")
+        AnalysisAgent(llm, cache=cache).analyze_research("data", "AI")
+        SummaryAgent(llm, cache=cache).create_summary("data", "analysis", "AI")
+
+        keys = [call[0][0] for call in cache.get_or_compute.call_args_list]
+        assert keys == [
+            ("research", "AI"),
+            ("analysis", "AI", _digest("data")),
+            ("summary", "AI", _digest("data"), _digest("analysis")),
+        ]
+        assert llm.invoke.call_count == 3
+
+    def test_analysis_not_reused_for_different_research(self, cache):
+        """Test that downstream results are keyed by their upstream inputs."""
+        llm = Mock()
+        llm.invoke = Mock(side_effect=["first analysis", "second analysis"])
+        agent = AnalysisAgent(llm, cache=cache)
+
+        assert agent.analyze_research("old research", "AI") == "first analysis"
+        assert agent.analyze_research("new research", "AI") == "second analysis"
+
+    def test_stream_serves_cache_hit_in_one_chunk(self):
+        """Test that a cached response is replayed without streaming."""
+        cache = Mock()
+        cache.get = Mock(return_value="cached response")
+        llm = Mock()
+        agent = ResearchAgent(llm, cache=cache)
+
+        assert list(agent.research_topic_stream("AI")) == ["cached response"]
+        llm.stream.assert_not_called()
+
+    def test_stream_stores_joined_response(self):
+        """Test that a streamed miss is cached as the full response text."""
+        cache = Mock()
+        cache.get = Mock(return_value=None)
+        llm = Mock()
+        llm.stream = Mock(return_value=iter(["Hello ", "world"]))
+        agent = ResearchAgent(llm, cache=cache)
+
+        list(agent.research_topic_stream("AI"))
+
+        key, prompt, value = cache.put.call_args[0]
+        assert key == ("research", "AI")
+        assert value == "Hello world"
+
+    def test_batch_only_sends_cache_misses(self):
+        """Test that cached topics are left out of the llm.batch call."""
+        cache = Mock()
+        cache.get = Mock(side_effect=lambda key, prompt: "cached" if key[1] == "AI" else None)
+        llm = Mock()
+        llm.batch = Mock(return_value=["fresh"])
+        agent = ResearchAgent(llm, cache=cache)
+
+        result = agent.research_topics(["AI", "ML"])
+
+        assert result == ["cached", "fresh"]
+        assert len(llm.batch.call_args[0][0]) == 1
+        cache.put.assert_called_once()
+        assert cache.put.call_args[0][0] == ("research", "ML")
+
 
 class TestAgentsIntegration:
     """Integration tests for all agents working together."""
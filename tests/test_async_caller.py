@@ -0,0 +1,84 @@
+import asyncio
+import httpx
+import pytest
+from unittest.mock import AsyncMock
+from openai import APIConnectionError, RateLimitError
+from async_caller import AsyncCaller
+
+
+def rate_limit_error():
+    """Build a RateLimitError as raised by the OpenAI client on HTTP 429."""
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return RateLimitError("slow down", response=httpx.Response(429, request=request), body=None)
+
+
+def connection_error():
+    """Build an APIConnectionError as raised on network failures."""
+    return APIConnectionError(request=httpx.Request("POST", "https://api.openai.com"))
+
+
+class TestAsyncCaller:
+    """Test suite for AsyncCaller class."""
+
+    @pytest.fixture
+    def caller(self):
+        """Create a caller that retries without sleeping."""
+        return AsyncCaller(max_concurrency=2, max_retries=3, max_backoff=0)
+
+    def test_passes_arguments_and_returns_result(self, caller):
+        """Test that call forwards arguments and returns the result."""
+        fn = AsyncMock(return_value="response")
+
+        assert asyncio.run(caller.call(fn, "prompt", stop=["\n"])) == "response"
+        fn.assert_awaited_once_with("prompt", stop=["\n"])
+
+    def test_retries_rate_limit_errors(self, caller):
+        """Test that rate-limit and connection errors are retried."""
+        fn = AsyncMock(side_effect=[rate_limit_error(), connection_error(), "response"])
+
+        assert asyncio.run(caller.call(fn)) == "response"
+        assert fn.await_count == 3
+
+    def test_gives_up_after_max_retries(self, caller):
+        """Test that the last error is raised once attempts are exhausted."""
+        fn = AsyncMock(side_effect=rate_limit_error())
+
+        with pytest.raises(RateLimitError):
+            asyncio.run(caller.call(fn))
+        assert fn.await_count == 3
+
+    def test_does_not_retry_other_errors(self, caller):
+        """Test that non-transient errors propagate immediately."""
+        fn = AsyncMock(side_effect=ValueError("bad request"))
+
+        with pytest.raises(ValueError):
+            asyncio.run(caller.call(fn))
+        fn.assert_awaited_once()
+
+    def test_limits_concurrent_calls(self, caller):
+        """Test that no more than max_concurrency calls run at once."""
+        in_flight = 0
+        peak = 0
+
+        async def slow():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        async def run():
+            await asyncio.gather(*(caller.call(slow) for _ in range(6)))
+
+        asyncio.run(run())
+        assert peak == 2
+
+    def test_reusable_across_event_loops(self, caller):
+        """Test that one caller works across separate asyncio.run calls."""
+        fn = AsyncMock(return_value="response")
+
+        async def run():
+            return await asyncio.gather(*(caller.call(fn) for _ in range(4)))
+
+        asyncio.run(run())
+        assert asyncio.run(run()) == ["response"] * 4
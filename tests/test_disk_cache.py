@@ -0,0 +1,72 @@
+import pytest
+import disk_cache
+
+
+class TestDiskCache:
+    """Test suite for the on-disk results cache."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        """Point the cache at a temporary directory."""
+        path = tmp_path / "agentic"
+        monkeypatch.setattr(disk_cache, "CACHE_DIR", path)
+        return path
+
+    def test_get_missing_key_returns_none(self):
+        """Test that an unknown key is a miss."""
+        assert disk_cache.get("missing") is None
+
+    def test_put_then_get_round_trips(self):
+        """Test that stored results are returned unchanged."""
+        results = {'topic': "AI & ML", 'final_summary': "Summary with émojis 🚀"}
+
+        disk_cache.put("key", results)
+
+        assert disk_cache.get("key") == results
+
+    def test_put_creates_cache_dir(self, cache_dir):
+        """Test that the cache directory is created on first write."""
+        disk_cache.put("key", {})
+
+        assert (cache_dir / "key.json").exists()
+        assert not list(cache_dir.glob("*.tmp"))
+
+    def test_corrupt_entry_is_a_miss(self, cache_dir):
+        """Test that an unreadable entry is treated as a miss."""
+        cache_dir.mkdir(parents=True)
+        (cache_dir / "key.json").write_text("{not json", encoding="utf-8")
+
+        assert disk_cache.get("key") is None
+
+    def test_directory_entry_is_a_miss(self, cache_dir):
+        """Test that an entry path that cannot be read as a file is a miss."""
+        (cache_dir / "key.json").mkdir(parents=True)
+
+        assert disk_cache.get("key") is None
+
+    def test_undecodable_entry_is_a_miss(self, cache_dir):
+        """Test that an entry that is not valid UTF-8 is a miss."""
+        cache_dir.mkdir(parents=True)
+        (cache_dir / "key.json").write_bytes(b"\xff\xfe\x00")
+
+        assert disk_cache.get("key") is None
+
+    def test_failed_write_is_swallowed_and_cleaned_up(self, cache_dir, monkeypatch, caplog):
+        """Test that a failed write logs a warning and leaves no temp file."""
+        def fail_replace(src, dst):
+            raise PermissionError("read-only")
+
+        monkeypatch.setattr(disk_cache.os, "replace", fail_replace)
+
+        disk_cache.put("key", {'topic': "AI"})
+
+        assert not list(cache_dir.iterdir())
+        assert "Could not write cache entry key" in caplog.text
+
+    def test_unwritable_cache_dir_is_ignored(self, cache_dir):
+        """Test that a cache path blocked by a file does not raise."""
+        cache_dir.write_text("not a directory", encoding="utf-8")
+
+        disk_cache.put("key", {})
+
+        assert disk_cache.get("key") is None
@@ -0,0 +1,58 @@
+import json
+import httpx
+import numpy as np
+import pytest
+from unittest.mock import patch
+import semantic_cache
+from embed_server import RemoteEmbedder
+
+
+def fake_server(request):
+    """Answer /embed like embed_server does, embedding each text as [len, 1, 0]."""
+    texts = json.loads(request.content)["texts"]
+    vectors = np.array([[len(t), 1.0, 0.0] for t in texts], dtype=np.float32)
+    return httpx.Response(
+        200, content=vectors.tobytes(), headers={"X-Embedding-Dim": "3"}
+    )
+
+
+class TestRemoteEmbedder:
+    """Test suite for the embed_server client."""
+
+    @pytest.fixture
+    def embedder(self):
+        """Create a client talking to an in-process fake server."""
+        embedder = RemoteEmbedder(transport=httpx.MockTransport(fake_server))
+        yield embedder
+        embedder.close()
+
+    def test_embed_many_decodes_float32_matrix(self, embedder):
+        """Test that the raw response body is decoded into one row per text."""
+        vectors = embedder.embed_many(["a", "abc"])
+
+        assert vectors.dtype == np.float32
+        np.testing.assert_array_equal(vectors, [[1, 1, 0], [3, 1, 0]])
+
+    def test_call_embeds_single_text(self, embedder):
+        """Test that the embedder can be used directly as SemanticCache(embed=...)."""
+        np.testing.assert_array_equal(embedder("ab"), [2, 1, 0])
+
+    def test_server_error_raises(self):
+        """Test that an HTTP error from the server is surfaced."""
+        embedder = RemoteEmbedder(transport=httpx.MockTransport(lambda r: httpx.Response(500)))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            embedder("text")
+
+    def test_default_embed_uses_server_when_socket_configured(self, monkeypatch):
+        """Test that AGENTIC_EMBED_SOCKET routes cache embeddings to the server."""
+        monkeypatch.setenv("AGENTIC_EMBED_SOCKET", "/tmp/test-embed.sock")
+        monkeypatch.setattr(semantic_cache, "_model", None)
+
+        with patch('embed_server.RemoteEmbedder') as remote:
+            remote.return_value.return_value = np.ones(3, dtype=np.float32)
+            result = semantic_cache._default_embed("topic")
+
+        remote.assert_called_once_with("/tmp/test-embed.sock")
+        remote.return_value.assert_called_once_with("topic")
+        np.testing.assert_array_equal(result, np.ones(3))
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+import llm_client
+from llm_client import get_llm
+
+
+class TestGetLLM:
+    """Test suite for the shared LLM factory."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self):
+        """Isolate each test from LLMs cached by other tests."""
+        get_llm.cache_clear()
+        yield
+        get_llm.cache_clear()
+
+    def test_returns_same_instance_for_same_settings(self):
+        """Test that repeated calls reuse one ChatOpenAI instance."""
+        with patch('llm_client.ChatOpenAI') as mock_chat:
+            assert get_llm("gpt-3.5-turbo", 0.7) is get_llm("gpt-3.5-turbo", 0.7)
+
+        mock_chat.assert_called_once()
+
+    def test_different_settings_share_http_clients(self):
+        """Test that every model is wired to the same connection pools."""
+        with patch('llm_client.ChatOpenAI') as mock_chat:
+            get_llm("gpt-3.5-turbo")
+            get_llm("gpt-4o-mini")
+
+        assert mock_chat.call_count == 2
+        for call in mock_chat.call_args_list:
+            assert call[1]['http_client'] is llm_client._shared_httpx
+            assert call[1]['http_async_client'] is llm_client._shared_async_httpx
+
+    def test_defaults_to_default_model(self):
+        """Test that the factory default matches the orchestrator's default stage model."""
+        with patch('llm_client.ChatOpenAI') as mock_chat:
+            get_llm()
+
+        assert mock_chat.call_args[1]['model'] == llm_client.DEFAULT_MODEL == "gpt-4o-mini"
+
+    def test_passes_model_and_temperature(self):
+        """Test that model settings are forwarded to ChatOpenAI."""
+        with patch('llm_client.ChatOpenAI') as mock_chat:
+            get_llm("gpt-4o-mini", 0.0)
+
+        call_kwargs = mock_chat.call_args[1]
+        assert call_kwargs['model'] == "gpt-4o-mini"
+        assert call_kwargs['temperature'] == 0.0
+
+
+class TestPerLoopTransport:
+    """Test suite for the async transport shared across event loops."""
+
+    def test_concurrent_loops_keep_their_own_pools(self):
+        """Test that threads running separate loops do not replace each other's pool."""
+        transport = llm_client._PerLoopTransport()
+        barrier = threading.Barrier(2)
+        seen = {}
+
+        def run(name):
+            async def main():
+                first = transport._get_transport()
+                barrier.wait()  # both loops are alive and have a pool now
+                second = transport._get_transport()
+                await transport.aclose()
+                return first, second
+
+            seen[name] = asyncio.run(main())
+
+        threads = [threading.Thread(target=run, args=(n,)) for n in ("a", "b")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert seen["a"][0] is seen["a"][1]
+        assert seen["b"][0] is seen["b"][1]
+        assert seen["a"][0] is not seen["b"][0]
+
+    def test_new_loop_gets_new_pool(self):
+        """Test that a later asyncio.run() does not reuse a closed loop's pool."""
+        transport = llm_client._PerLoopTransport()
+
+        async def get():
+            return transport._get_transport()
+
+        assert asyncio.run(get()) is not asyncio.run(get())
@@ -1,7 +1,53 @@
+import asyncio
+import io
+import json
+import logging
 import pytest
 import os
-from unittest.mock import Mock, MagicMock, patch, mock_open
-from orchestrator import MultiAgentOrchestrator
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, Mock, MagicMock, patch, mock_open
+import numpy as np
+import openai
+from langchain_openai import ChatOpenAI
+import llm_client
+from agents import _digest
+from orchestrator import MultiAgentOrchestrator, PipelineStep
+from semantic_cache import SemanticCache
+
+
+def _start_chat_server(status):
+    """Start a local chat-completions server answering every request with ``status``."""
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            requests.append(self.path)
+            if status == 200:
+                payload = {
+                    "id": "chatcmpl-test", "object": "chat.completion", "created": 0,
+                    "model": "gpt-4o-mini",
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": "ok"}}],
+                }
+            else:
+                payload = {"error": {"message": "rate limited", "type": "rate_limit_error"}}
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1", requests
 
 
 class TestMultiAgentOrchestrator:
@@ -23,33 +69,67 @@ class TestMultiAgentOrchestrator:
     @pytest.fixture
     def orchestrator(self, mock_env, mock_llm):
         """Create an orchestrator instance with mocked dependencies."""
-        with patch('orchestrator.ChatOpenAI', return_value=mock_llm):
+        with patch('orchestrator.get_llm', return_value=mock_llm):
             return MultiAgentOrchestrator()
 
     def test_init_creates_agents(self, mock_env, mock_llm):
         """Test that initialization creates all necessary agents."""
-        with patch('orchestrator.ChatOpenAI', return_value=mock_llm):
+        with patch('orchestrator.get_llm', return_value=mock_llm):
             orchestrator = MultiAgentOrchestrator()
 
             assert orchestrator.llm is not None
             assert orchestrator.research_agent is not None
             assert orchestrator.analysis_agent is not None
             assert orchestrator.summary_agent is not None
+            assert orchestrator.research_agent.caller is orchestrator.caller
+            assert orchestrator.summary_agent.caller is orchestrator.caller
 
-    def test_init_creates_llm_with_correct_params(self, mock_env):
-        """Test that LLM is initialized with correct parameters."""
-        with patch('orchestrator.ChatOpenAI') as mock_chat_openai:
+    @pytest.fixture
+    def fresh_llm_cache(self):
+        """Make get_llm build a new ChatOpenAI for this test only."""
+        llm_client.get_llm.cache_clear()
+        yield
+        llm_client.get_llm.cache_clear()
+
+    def test_init_creates_llm_with_correct_params(self, mock_env, fresh_llm_cache):
+        """Test that each stage's LLM is initialized with correct parameters."""
+        with patch('llm_client.ChatOpenAI') as mock_chat_openai:
             MultiAgentOrchestrator()
 
-            # Verify ChatOpenAI was called with correct parameters
-            mock_chat_openai.assert_called_once()
-            call_kwargs = mock_chat_openai.call_args[1]
-            assert call_kwargs['api_key'] == 'test-api-key'
-            assert call_kwargs['temperature'] == 0.7
-            assert call_kwargs['model'] == 'gpt-3.5-turbo'
-
-    def test_run_research_pipeline_basic(self, orchestrator, capsys):
+            # One ChatOpenAI per distinct model and retry setting, all sharing
+            # the connection pool; the async ones leave retrying to AsyncCaller
+            settings = sorted((call[1]['model'], call[1]['max_retries'] == 0)
+                              for call in mock_chat_openai.call_args_list)
+            assert settings == [('gpt-4o-mini', False), ('gpt-4o-mini', True)]
+            for call in mock_chat_openai.call_args_list:
+                call_kwargs = call[1]
+                assert call_kwargs['api_key'] == 'test-api-key'
+                assert call_kwargs['temperature'] == 0.7
+                assert call_kwargs['http_async_client'] is llm_client._shared_async_httpx
+
+    def test_init_routes_models_per_stage(self, mock_env):
+        """Test that stages run on their configured models."""
+        with patch('orchestrator.get_llm', side_effect=lambda model, temperature, **kw: Mock(model_name=model)):
+            orchestrator = MultiAgentOrchestrator(stage_models={"research": "gpt-4o"})
+
+        assert orchestrator.research_agent.llm.model_name == "gpt-4o"
+        assert orchestrator.analysis_agent.llm.model_name == "gpt-4o-mini"
+        assert orchestrator.summary_agent.llm.model_name == "gpt-4o-mini"
+        assert orchestrator.llm is orchestrator.research_agent.llm
+
+    def test_init_with_shared_llm(self, mock_llm):
+        """Test that an explicit llm is used for every stage."""
+        with patch('orchestrator.get_llm') as mock_get_llm:
+            orchestrator = MultiAgentOrchestrator(llm=mock_llm)
+
+        mock_get_llm.assert_not_called()
+        assert orchestrator.research_agent.llm is mock_llm
+        assert orchestrator.analysis_agent.llm is mock_llm
+        assert orchestrator.summary_agent.llm is mock_llm
+
+    def test_run_research_pipeline_basic(self, orchestrator, caplog):
         """Test basic pipeline execution."""
+        caplog.set_level(logging.INFO, logger="orchestrator")
         topic = "artificial intelligence"
 
         # Mock agent responses
@@ -73,12 +153,22 @@ class TestMultiAgentOrchestrator:
         assert result['final_summary'] == "Summary data"
 
         # Verify console output
-        captured = capsys.readouterr()
-        assert "Starting research pipeline" in captured.out
-        assert "Research Agent working" in captured.out
-        assert "Analysis Agent working" in captured.out
-        assert "Summary Agent working" in captured.out
-        assert "Pipeline completed" in captured.out
+        # Verify progress logging
+        assert "Starting research pipeline for artificial intelligence" in caplog.text
+        assert "Stage research starting" in caplog.text
+        assert "Stage analysis starting" in caplog.text
+        assert "Stage summary starting" in caplog.text
+        assert "Pipeline completed" in caplog.text
+
+    def test_run_research_pipeline_is_silent_on_stdout(self, orchestrator, capsys):
+        """Test that library progress goes to logging, not stdout."""
+        orchestrator.research_agent.research_topic = Mock(return_value="R")
+        orchestrator.analysis_agent.analyze_research = Mock(return_value="A")
+        orchestrator.summary_agent.create_summary = Mock(return_value="S")
+
+        orchestrator.run_research_pipeline("topic")
+
+        assert capsys.readouterr().out == ""
 
     def test_run_research_pipeline_returns_correct_dict(self, orchestrator):
         """Test that pipeline returns a dictionary with all required keys."""
@@ -139,6 +229,244 @@ class TestMultiAgentOrchestrator:
 
         assert call_order == ['research', 'analysis', 'summary']
 
+    def test_run_research_pipeline_disk_cache_hit_skips_agents(self, orchestrator):
+        """Test that a cached topic returns stored results without LLM calls."""
+        cached = {'topic': "AI", 'research_data': "R", 'analysis': "A", 'final_summary': "S"}
+        orchestrator.use_disk_cache = True
+        orchestrator.research_agent.research_topic = Mock()
+
+        with patch('orchestrator.disk_cache.get', return_value=cached) as get:
+            result = orchestrator.run_research_pipeline("AI")
+
+        assert result == cached
+        get.assert_called_once_with(orchestrator._disk_cache_key("AI"))
+        orchestrator.research_agent.research_topic.assert_not_called()
+
+    def test_run_research_pipeline_disk_cache_miss_stores_results(self, orchestrator):
+        """Test that fresh results are written to the disk cache."""
+        orchestrator.use_disk_cache = True
+        orchestrator.research_agent.research_topic = Mock(return_value="R")
+        orchestrator.analysis_agent.analyze_research = Mock(return_value="A")
+        orchestrator.summary_agent.create_summary = Mock(return_value="S")
+
+        with patch('orchestrator.disk_cache.get', return_value=None), \
+                patch('orchestrator.disk_cache.put') as put:
+            result = orchestrator.run_research_pipeline("AI")
+
+        put.assert_called_once_with(orchestrator._disk_cache_key("AI"), result)
+
+    def test_run_research_pipeline_force_refresh_ignores_disk_cache(self, orchestrator):
+        """Test that force_refresh re-runs the pipeline despite a cached entry."""
+        orchestrator.use_disk_cache = True
+        orchestrator.research_agent.research_topic = Mock(return_value="R")
+        orchestrator.analysis_agent.analyze_research = Mock(return_value="A")
+        orchestrator.summary_agent.create_summary = Mock(return_value="S")
+
+        with patch('orchestrator.disk_cache.get') as get, patch('orchestrator.disk_cache.put'):
+            result = orchestrator.run_research_pipeline("AI", force_refresh=True)
+
+        get.assert_not_called()
+        assert result['research_data'] == "R"
+
+    def test_disk_cache_disabled_by_default(self, orchestrator):
+        """Test that the disk cache is not touched unless enabled."""
+        orchestrator.research_agent.research_topic = Mock(return_value="R")
+        orchestrator.analysis_agent.analyze_research = Mock(return_value="A")
+        orchestrator.summary_agent.create_summary = Mock(return_value="S")
+
+        with patch('orchestrator.disk_cache.get') as get, patch('orchestrator.disk_cache.put') as put:
+            orchestrator.run_research_pipeline("AI")
+
+        get.assert_not_called()
+        put.assert_not_called()
+
+    def test_disk_cache_key_depends_on_models(self, orchestrator):
+        """Test that changing a stage model changes the cache key."""
+        orchestrator.research_agent.llm = Mock(model_name="gpt-4o-mini")
+        before = orchestrator._disk_cache_key("AI")
+        orchestrator.research_agent.llm = Mock(model_name="gpt-4o")
+
+        assert orchestrator._disk_cache_key("AI") != before
+
+    def test_stream_research_pipeline_replays_disk_cache_hit(self, orchestrator):
+        """Test that a cached report is printed instead of streamed."""
+        cached = {'topic': "AI", 'research_data': "R", 'analysis': "A", 'final_summary': "S"}
+        orchestrator.use_disk_cache = True
+        orchestrator.research_agent.research_topic_stream = Mock()
+        out = io.StringIO()
+
+        with patch('orchestrator.disk_cache.get', return_value=cached):
+            result = orchestrator.stream_research_pipeline("AI", out=out)
+
+        assert result == cached
+        assert "FINAL SUMMARY:\nS" in out.getvalue()
+        orchestrator.research_agent.research_topic_stream.assert_not_called()
+
+    def test_stream_research_pipeline(self, orchestrator):
+        """Test that chunks reach the output stream and feed downstream stages."""
+        orchestrator.research_agent.research_topic_stream = Mock(return_value=iter(["Re", "search"]))
+        orchestrator.analysis_agent.analyze_research_stream = Mock(return_value=iter(["Analysis"]))
+        orchestrator.summary_agent.create_summary_stream = Mock(return_value=iter(["Sum", "mary"]))
+        out = io.StringIO()
+
+        result = orchestrator.stream_research_pipeline("topic", out=out)
+
+        orchestrator.analysis_agent.analyze_research_stream.assert_called_once_with("Research", "topic")
+        orchestrator.summary_agent.create_summary_stream.assert_called_once_with(
+            "Research", "Analysis", "topic"
+        )
+        assert result == {
+            'topic': "topic",
+            'research_data': "Research",
+            'analysis': "Analysis",
+            'final_summary': "Summary"
+        }
+        assert "Research" in out.getvalue()
+        assert "FINAL SUMMARY:\nSummary" in out.getvalue()
+
+    def test_stream_research_pipeline_file_matches_save_results(self, orchestrator, tmp_path):
+        """Test that the streamed report file matches the save_results format."""
+        orchestrator.research_agent.research_topic_stream = Mock(return_value=iter(["R1", "R2"]))
+        orchestrator.analysis_agent.analyze_research_stream = Mock(return_value=iter(["A"]))
+        orchestrator.summary_agent.create_summary_stream = Mock(return_value=iter(["S"]))
+        streamed = tmp_path / "streamed.txt"
+        saved = tmp_path / "saved.txt"
+
+        result = orchestrator.stream_research_pipeline("topic", filename=str(streamed), out=io.StringIO())
+        orchestrator.save_results(result, filename=str(saved)).result()
+
+        assert streamed.read_text(encoding='utf-8') == saved.read_text(encoding='utf-8')
+
+    def test_run_batch(self, orchestrator):
+        """Test that run_batch chains the three batch calls and builds results."""
+        topics = ["AI", "ML"]
+
+        orchestrator.research_agent.research_topics = Mock(return_value=["R1", "R2"])
+        orchestrator.analysis_agent.analyze_many = Mock(return_value=["A1", "A2"])
+        orchestrator.summary_agent.summarize_many = Mock(return_value=["S1", "S2"])
+
+        results = orchestrator.run_batch(topics)
+
+        orchestrator.analysis_agent.analyze_many.assert_called_once_with(
+            ["R1", "R2"], topics, orchestrator.max_concurrency
+        )
+        orchestrator.summary_agent.summarize_many.assert_called_once_with(
+            ["R1", "R2"], ["A1", "A2"], topics, orchestrator.max_concurrency
+        )
+        assert results == [
+            {'topic': "AI", 'research_data': "R1", 'analysis': "A1", 'final_summary': "S1"},
+            {'topic': "ML", 'research_data': "R2", 'analysis': "A2", 'final_summary': "S2"},
+        ]
+
+    def test_arun_research_pipeline(self, orchestrator):
+        """Test the async pipeline awaits each stage with upstream outputs."""
+        topic = "async topic"
+
+        orchestrator.research_agent.aresearch_topic = AsyncMock(return_value="R")
+        orchestrator.analysis_agent.aanalyze_research = AsyncMock(return_value="A")
+        orchestrator.summary_agent.acreate_summary = AsyncMock(return_value="S")
+
+        result = asyncio.run(orchestrator.arun_research_pipeline(topic))
+
+        orchestrator.research_agent.aresearch_topic.assert_awaited_once_with(topic=topic)
+        orchestrator.analysis_agent.aanalyze_research.assert_awaited_once_with(
+            research_data="R", topic=topic
+        )
+        orchestrator.summary_agent.acreate_summary.assert_awaited_once_with(
+            research_data="R", analysis="A", topic=topic
+        )
+        assert result == {
+            'topic': topic,
+            'research_data': "R",
+            'analysis': "A",
+            'final_summary': "S"
+        }
+
+    def test_arun_research_pipeline_runs_sibling_steps_concurrently(self, orchestrator):
+        """Test that steps sharing a DAG layer overlap instead of running serially."""
+        in_flight = 0
+        peak = 0
+
+        async def slow(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "A"
+
+        orchestrator.research_agent.aresearch_topic = AsyncMock(return_value="R")
+        orchestrator.analysis_agent.aanalyze_research = AsyncMock(side_effect=slow)
+        orchestrator.summary_agent.acreate_summary = AsyncMock(return_value="S")
+        critique = AsyncMock(side_effect=slow)
+        orchestrator.steps.append(PipelineStep("critique", critique, depends_on=("research_data",)))
+
+        result = asyncio.run(orchestrator.arun_research_pipeline("topic"))
+
+        critique.assert_awaited_once_with(topic="topic", research_data="R")
+        assert result['critique'] == "A"
+        assert result['final_summary'] == "S"
+        assert peak == 2
+
+    def test_arun_research_pipeline_rejects_unresolvable_steps(self, orchestrator):
+        """Test that a step depending on an unknown output raises ValueError."""
+        orchestrator.research_agent.aresearch_topic = AsyncMock(return_value="R")
+        orchestrator.steps = [PipelineStep("orphan", AsyncMock(), depends_on=("missing",))]
+
+        with pytest.raises(ValueError, match="orphan"):
+            asyncio.run(orchestrator.arun_research_pipeline("topic"))
+
+    def test_arun_research_pipeline_raises_stage_error_unwrapped(self, orchestrator):
+        """Test that a failing stage raises its own exception, not an ExceptionGroup."""
+        orchestrator.research_agent.aresearch_topic = AsyncMock(return_value="R")
+        orchestrator.analysis_agent.aanalyze_research = AsyncMock(side_effect=ValueError("boom"))
+        orchestrator.summary_agent.acreate_summary = AsyncMock(return_value="S")
+
+        with pytest.raises(ValueError, match="boom"):
+            asyncio.run(orchestrator.arun_research_pipeline("topic"))
+        orchestrator.summary_agent.acreate_summary.assert_not_awaited()
+
+    def test_arun_many_raises_stage_error_unwrapped(self, orchestrator):
+        """Test that arun_many surfaces the failing stage's exception directly."""
+        orchestrator.research_agent.aresearch_topic = AsyncMock(side_effect=ValueError("boom"))
+
+        with pytest.raises(ValueError, match="boom"):
+            asyncio.run(orchestrator.arun_many(["a", "b"]))
+
+    def test_arun_many_preserves_topic_order(self, orchestrator):
+        """Test that arun_many returns one result per topic, in order."""
+        orchestrator.research_agent.aresearch_topic = AsyncMock(side_effect=lambda topic: f"R-{topic}")
+        orchestrator.analysis_agent.aanalyze_research = AsyncMock(return_value="A")
+        orchestrator.summary_agent.acreate_summary = AsyncMock(return_value="S")
+
+        results = asyncio.run(orchestrator.arun_many(["a", "b", "c"]))
+
+        assert [r['topic'] for r in results] == ["a", "b", "c"]
+        assert [r['research_data'] for r in results] == ["R-a", "R-b", "R-c"]
+
+    def test_arun_many_respects_max_concurrency(self, orchestrator):
+        """Test that no more than max_concurrency pipelines run at once."""
+        orchestrator.max_concurrency = 2
+        in_flight = 0
+        peak = 0
+
+        async def slow_research(topic):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "R"
+
+        orchestrator.research_agent.aresearch_topic = AsyncMock(side_effect=slow_research)
+        orchestrator.analysis_agent.aanalyze_research = AsyncMock(return_value="A")
+        orchestrator.summary_agent.acreate_summary = AsyncMock(return_value="S")
+
+        results = asyncio.run(orchestrator.arun_many([str(i) for i in range(6)]))
+
+        assert len(results) == 6
+        assert peak == 2
+
     def test_save_results_with_default_filename(self, orchestrator):
         """Test saving results with default filename."""
         results = {
@@ -166,17 +494,15 @@ FINAL SUMMARY:
 Summary content"""
 
         with patch('builtins.open', mock_open()) as mocked_file:
-            orchestrator.save_results(results)
+            orchestrator.save_results(results).result()
 
             # Verify file was opened with correct filename
-            mocked_file.assert_called_once_with(expected_filename, 'w')
+            mocked_file.assert_called_once_with(expected_filename, 'w', encoding='utf-8')
 
             # Get all write calls and combine them
+            # The whole report is written in a single call
             handle = mocked_file()
-            write_calls = [call[0][0] for call in handle.write.call_args_list]
-            actual_content = ''.join(write_calls)
-
-            assert actual_content == expected_content
+            handle.write.assert_called_once_with(expected_content)
 
     def test_save_results_with_custom_filename(self, orchestrator):
         """Test saving results with custom filename."""
@@ -190,9 +516,9 @@ Summary content"""
         custom_filename = "custom_report.txt"
 
         with patch('builtins.open', mock_open()) as mocked_file:
-            orchestrator.save_results(results, filename=custom_filename)
+            orchestrator.save_results(results, filename=custom_filename).result()
 
-            mocked_file.assert_called_once_with(custom_filename, 'w')
+            mocked_file.assert_called_once_with(custom_filename, 'w', encoding='utf-8')
 
     def test_save_results_replaces_spaces_in_topic(self, orchestrator):
         """Test that spaces in topic are replaced with underscores in filename."""
@@ -204,11 +530,31 @@ Summary content"""
         }
 
         with patch('builtins.open', mock_open()) as mocked_file:
-            orchestrator.save_results(results)
+            orchestrator.save_results(results).result()
 
             # Verify filename has underscores instead of spaces
             expected_filename = "research_report_machine_learning_basics.txt"
-            mocked_file.assert_called_once_with(expected_filename, 'w')
+            mocked_file.assert_called_once_with(expected_filename, 'w', encoding='utf-8')
+
+    @pytest.mark.parametrize("topic, expected_filename", [
+        ("AI & ML: 2024/2025 \"Trends\"", "research_report_AI_ML_2024_2025_Trends.txt"),
+        ("../etc/passwd", "research_report_.._etc_passwd.txt"),
+        ("Café  résumé", "research_report_Caf_r_sum.txt"),
+        ("x" * 300, f"research_report_{'x' * 120}.txt"),
+    ])
+    def test_save_results_sanitizes_topic_in_filename(self, orchestrator, topic, expected_filename):
+        """Test that unsafe characters in the topic never reach the filename."""
+        results = {
+            'topic': topic,
+            'research_data': 'R',
+            'analysis': 'A',
+            'final_summary': 'S'
+        }
+
+        with patch('builtins.open', mock_open()) as mocked_file:
+            orchestrator.save_results(results).result()
+
+            mocked_file.assert_called_once_with(expected_filename, 'w', encoding='utf-8')
 
     def test_save_results_writes_correct_structure(self, orchestrator):
         """Test that saved file has correct structure."""
@@ -220,7 +566,7 @@ Summary content"""
         }
 
         with patch('builtins.open', mock_open()) as mocked_file:
-            orchestrator.save_results(results)
+            orchestrator.save_results(results).result()
 
             handle = mocked_file()
             write_calls = [call[0][0] for call in handle.write.call_args_list]
@@ -236,8 +582,9 @@ Summary content"""
             assert 'SUMMARY' in full_content
             assert '=' * 50 in full_content
 
-    def test_save_results_prints_confirmation(self, orchestrator, capsys):
-        """Test that save_results prints confirmation message."""
+    def test_save_results_logs_confirmation(self, orchestrator, caplog):
+        """Test that save_results logs a confirmation message."""
+        caplog.set_level(logging.INFO, logger="orchestrator")
         results = {
             'topic': 'test',
             'research_data': 'R',
@@ -248,10 +595,100 @@ Summary content"""
         filename = "test_report.txt"
 
         with patch('builtins.open', mock_open()):
-            orchestrator.save_results(results, filename=filename)
+            orchestrator.save_results(results, filename=filename).result()
 
-        captured = capsys.readouterr()
-        assert f"Results saved to {filename}" in captured.out
+        assert f"Results saved to {filename}" in caplog.text
+
+    def test_save_results_binary_json_round_trips(self, orchestrator, tmp_path):
+        """Test that the orjson report loads back to the same results."""
+        orjson = pytest.importorskip("orjson")
+        results = {
+            'topic': 'AI & ML',
+            'research_data': 'Research with émojis 🚀',
+            'analysis': 'A',
+            'final_summary': 'S'
+        }
+        path = tmp_path / "report.json"
+
+        orchestrator.save_results_binary(results, str(path)).result()
+
+        assert orjson.loads(path.read_bytes()) == results
+
+    def test_save_results_binary_msgpack_from_extension(self, orchestrator, tmp_path):
+        """Test that a .mpk path is written as msgpack."""
+        msgpack = pytest.importorskip("msgpack")
+        results = {'topic': 't', 'research_data': 'R', 'analysis': 'A', 'final_summary': 'S'}
+        path = tmp_path / "report.mpk"
+
+        orchestrator.save_results_binary(results, str(path)).result()
+
+        assert msgpack.unpackb(path.read_bytes()) == results
+
+    def test_save_results_binary_default_filename(self, orchestrator):
+        """Test that the default binary filename uses the sanitized topic."""
+        pytest.importorskip("orjson")
+        results = {'topic': 'machine learning', 'research_data': 'R', 'analysis': 'A', 'final_summary': 'S'}
+
+        with patch('orchestrator.Path.write_bytes', autospec=True) as write_bytes:
+            orchestrator.save_results_binary(results).result()
+
+        assert str(write_bytes.call_args[0][0]) == "research_report_machine_learning.json"
+
+    def test_save_results_binary_rejects_unknown_format(self, orchestrator):
+        """Test that an unsupported format fails before anything is queued."""
+        with pytest.raises(ValueError, match="xml"):
+            orchestrator.save_results_binary({'topic': 't'}, "report.xml")
+
+    def test_save_results_binary_missing_serializer_raises_in_caller(self, orchestrator):
+        """Test that a missing optional serializer fails before anything is queued."""
+        with patch.dict('sys.modules', {'msgpack': None}):
+            with patch.object(orchestrator._io_pool, 'submit') as submit:
+                with pytest.raises(ImportError):
+                    orchestrator.save_results_binary({'topic': 't'}, "report.mpk")
+
+        submit.assert_not_called()
+
+    def test_save_results_returns_future_from_io_pool(self, orchestrator):
+        """Test that the write runs on a background thread."""
+        results = {
+            'topic': 'test',
+            'research_data': 'R',
+            'analysis': 'A',
+            'final_summary': 'S'
+        }
+        threads = []
+
+        def record_thread(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return mock_open()()
+
+        with patch('builtins.open', side_effect=record_thread):
+            future = orchestrator.save_results(results)
+            future.result()
+
+        assert threads and threads[0].startswith("orc-io")
+
+    def test_save_results_failure_surfaces_through_future(self, orchestrator):
+        """Test that a failed background write is raised by .result()."""
+        results = {
+            'topic': 'test',
+            'research_data': 'R',
+            'analysis': 'A',
+            'final_summary': 'S'
+        }
+
+        with patch('builtins.open', side_effect=PermissionError("read-only")):
+            future = orchestrator.save_results(results)
+            with pytest.raises(PermissionError):
+                future.result()
+
+    def test_context_manager_shuts_down_io_pool(self, orchestrator):
+        """Test that leaving the with-block waits for pending writes."""
+        with orchestrator as o:
+            assert o is orchestrator
+
+        with pytest.raises(RuntimeError):
+            orchestrator.save_results({'topic': 't'}, filename="unused.txt")
 
     def test_save_results_with_multiline_content(self, orchestrator):
         """Test saving results with multiline content."""
@@ -263,7 +700,7 @@ Summary content"""
         }
 
         with patch('builtins.open', mock_open()) as mocked_file:
-            orchestrator.save_results(results)
+            orchestrator.save_results(results).result()
 
             handle = mocked_file()
             write_calls = [call[0][0] for call in handle.write.call_args_list]
@@ -292,7 +729,7 @@ class TestMultiAgentOrchestratorIntegration:
             "Executive summary of AI research"
         ])
 
-        with patch('orchestrator.ChatOpenAI', return_value=mock_llm):
+        with patch('orchestrator.get_llm', return_value=mock_llm):
             orchestrator = MultiAgentOrchestrator()
             result = orchestrator.run_research_pipeline("artificial intelligence")
 
@@ -310,12 +747,12 @@ class TestMultiAgentOrchestratorIntegration:
         mock_llm = Mock()
         mock_llm.invoke = Mock(return_value="Test response")
 
-        with patch('orchestrator.ChatOpenAI', return_value=mock_llm):
+        with patch('orchestrator.get_llm', return_value=mock_llm):
             orchestrator = MultiAgentOrchestrator()
             result = orchestrator.run_research_pipeline("test topic")
 
             with patch('builtins.open', mock_open()) as mocked_file:
-                orchestrator.save_results(result)
+                orchestrator.save_results(result).result()
 
                 # Verify file was created
                 mocked_file.assert_called_once()
@@ -328,10 +765,83 @@ class TestMultiAgentOrchestratorIntegration:
         """Test behavior when OPENAI_API_KEY is not set."""
         # This test verifies that the code attempts to get the API key
         # The actual behavior depends on how dotenv and OpenAI handle missing keys
+        llm_client.get_llm.cache_clear()
         with patch.dict(os.environ, {}, clear=True):
             with patch('orchestrator.load_dotenv'):
-                with patch('orchestrator.ChatOpenAI') as mock_chat:
+                with patch('llm_client.ChatOpenAI') as mock_chat:
                     MultiAgentOrchestrator()
 
                     # Verify ChatOpenAI was called (even with None api_key)
                     assert mock_chat.called
+        llm_client.get_llm.cache_clear()
+
+    def test_semantic_cache_never_mixes_stale_downstream_results(self):
+        """Test that fresh research is not paired with analysis of older research."""
+        vectors = {"machine learning": [1.0, 0.0], "ML": [0.95, 0.05], "cooking": [0.0, 1.0]}
+        cache = SemanticCache(maxsize=3, embed=lambda t: np.array(vectors[t], dtype=np.float32))
+        mock_llm = Mock()
+        mock_llm.invoke = Mock(side_effect=[f"out{i}" for i in range(7)])
+        orchestrator = MultiAgentOrchestrator(llm=mock_llm, cache=cache)
+
+        orchestrator.run_research_pipeline("machine learning")
+        orchestrator.research_agent.research_topic("cooking")  # evicts the research row
+        cache.get(("analysis", "machine learning", _digest("out0")), "other prompt")
+        cache.get(("summary", "machine learning", _digest("out0"), _digest("out1")), "other prompt")
+        result = orchestrator.run_research_pipeline("ML")
+
+        assert result['research_data'] == "out4"
+        assert result['analysis'] == "out5"
+        assert result['final_summary'] == "out6"
+
+    @pytest.fixture
+    def chat_server(self):
+        """Serve canned chat completions from a local HTTP server."""
+        server, url, _ = _start_chat_server(200)
+        yield url
+        server.shutdown()
+        server.server_close()
+
+    @pytest.fixture
+    def rate_limited_server(self):
+        """Serve HTTP 429 for every request, recording each attempt."""
+        server, url, requests = _start_chat_server(429)
+        yield url, requests
+        server.shutdown()
+        server.server_close()
+
+    @pytest.fixture
+    def fresh_llm_cache(self):
+        """Make get_llm build a new ChatOpenAI for this test only."""
+        llm_client.get_llm.cache_clear()
+        yield
+        llm_client.get_llm.cache_clear()
+
+    def test_async_calls_are_retried_only_by_async_caller(self, rate_limited_server,
+                                                          fresh_llm_cache):
+        """Test that SDK retries are off for LLMs driven through AsyncCaller."""
+        url, requests = rate_limited_server
+        with patch.dict(os.environ, {'OPENAI_API_KEY': 'test-api-key', 'OPENAI_BASE_URL': url}):
+            orchestrator = MultiAgentOrchestrator()
+        orchestrator.caller.max_retries = 3
+        orchestrator.caller.max_backoff = 0
+
+        with pytest.raises(openai.RateLimitError):
+            asyncio.run(orchestrator.research_agent.aresearch_topic("AI"))
+
+        assert len(requests) == 3
+
+    def test_arun_research_pipeline_across_event_loops(self, chat_server):
+        """Test that the shared async client survives separate asyncio.run calls."""
+        llm = ChatOpenAI(
+            api_key="test-api-key",
+            base_url=chat_server,
+            max_retries=0,
+            http_client=llm_client._shared_httpx,
+            http_async_client=llm_client._shared_async_httpx,
+        )
+        orchestrator = MultiAgentOrchestrator(llm=llm)
+
+        first = asyncio.run(orchestrator.arun_research_pipeline("first topic"))
+        second = asyncio.run(orchestrator.arun_research_pipeline("second topic"))
+
+        assert first['final_summary'] == second['final_summary'] == "ok"
@@ -0,0 +1,136 @@
+import json
+import os
+import pytest
+from unittest.mock import Mock, patch
+from orchestrator import MultiAgentOrchestrator
+from orchestrator_batch import BatchOrchestrator
+
+
+def output_file(stage, contents):
+    """Build a Batch API output file body for the given stage results."""
+    lines = [
+        json.dumps({
+            "custom_id": f"{i}:{stage}",
+            "response": {
+                "status_code": 200,
+                "body": {"choices": [{"message": {"content": content}}]},
+            },
+            "error": None,
+        })
+        for i, content in enumerate(contents)
+    ]
+    return Mock(text="\n".join(lines))
+
+
+class TestBatchOrchestrator:
+    """Test suite for BatchOrchestrator class."""
+
+    @pytest.fixture
+    def mock_llm(self):
+        """Create a mock LLM carrying the model settings used in batch bodies."""
+        llm = Mock()
+        llm.model_name = "gpt-3.5-turbo"
+        llm.temperature = 0.7
+        return llm
+
+    @pytest.fixture
+    def client(self):
+        """Create a mock OpenAI client whose batches complete on first poll."""
+        client = Mock()
+        client.files.create = Mock(side_effect=lambda **kw: Mock(id=f"file-{kw['purpose']}"))
+        stages = iter(["research", "analysis", "summary"])
+
+        def create_batch(**kwargs):
+            stage = next(stages)
+            return Mock(id=f"batch-{stage}", status="validating", output_file_id=None)
+
+        def retrieve(batch_id):
+            return Mock(id=batch_id, status="completed", output_file_id=f"out-{batch_id[6:]}")
+
+        client.batches.create = Mock(side_effect=create_batch)
+        client.batches.retrieve = Mock(side_effect=retrieve)
+        client.files.content = Mock(side_effect=lambda file_id: {
+            "out-research": output_file("research", ["R0", "R1"]),
+            "out-analysis": output_file("analysis", ["A0", "A1"]),
+            "out-summary": output_file("summary", ["S0", "S1"]),
+        }[file_id])
+        return client
+
+    @pytest.fixture
+    def orchestrator(self, mock_llm, client):
+        """Create a BatchOrchestrator with mocked LLM and client."""
+        with patch.dict(os.environ, {'OPENAI_API_KEY': 'test-api-key'}):
+            with patch('orchestrator.get_llm', return_value=mock_llm):
+                return BatchOrchestrator(client=client)
+
+    def test_run_batch_offline_reassembles_results(self, orchestrator):
+        """Test that stage outputs are matched back to topics by custom_id."""
+        with patch('orchestrator_batch.time.sleep') as sleep:
+            results = orchestrator.run_batch_offline(["AI", "ML"], poll_interval=5)
+
+        assert results == [
+            {'topic': "AI", 'research_data': "R0", 'analysis': "A0", 'final_summary': "S0"},
+            {'topic': "ML", 'research_data': "R1", 'analysis': "A1", 'final_summary': "S1"},
+        ]
+        sleep.assert_called_with(5)
+        assert sleep.call_count == 3
+
+    def test_empty_topics_submit_nothing(self, orchestrator, client):
+        """Test that no batch is created when there are no topics."""
+        assert orchestrator.run_batch_offline([]) == []
+
+        client.files.create.assert_not_called()
+        client.batches.create.assert_not_called()
+
+    def test_submits_one_batch_per_stage(self, orchestrator, client):
+        """Test that each stage is uploaded and submitted as its own batch."""
+        with patch('orchestrator_batch.time.sleep'):
+            orchestrator.run_batch_offline(["AI", "ML"])
+
+        assert client.files.create.call_count == 3
+        assert client.batches.create.call_count == 3
+        for call in client.batches.create.call_args_list:
+            assert call[1]['endpoint'] == "/v1/chat/completions"
+            assert call[1]['completion_window'] == "24h"
+
+    def test_request_file_contents(self, orchestrator, client):
+        """Test the JSONL request lines for the research stage."""
+        with patch('orchestrator_batch.time.sleep'):
+            orchestrator.run_batch_offline(["AI", "ML"])
+
+        upload = client.files.create.call_args_list[0][1]
+        assert upload['purpose'] == "batch"
+        lines = [json.loads(l) for l in upload['file'][1].decode("utf-8").splitlines()]
+        assert [l['custom_id'] for l in lines] == ["0:research", "1:research"]
+        assert lines[0]['body']['model'] == "gpt-3.5-turbo"
+        assert lines[0]['body']['temperature'] == 0.7
+        assert "AI" in lines[0]['body']['messages'][0]['content']
+
+    def test_analysis_prompts_use_research_output(self, orchestrator, client):
+        """Test that the analysis batch is built from the research results."""
+        with patch('orchestrator_batch.time.sleep'):
+            orchestrator.run_batch_offline(["AI", "ML"])
+
+        upload = client.files.create.call_args_list[1][1]
+        lines = [json.loads(l) for l in upload['file'][1].decode("utf-8").splitlines()]
+        assert "R1" in lines[1]['body']['messages'][0]['content']
+
+    def test_failed_batch_raises(self, orchestrator, client):
+        """Test that a batch ending in a non-completed state raises."""
+        client.batches.retrieve = Mock(return_value=Mock(id="batch-x", status="expired"))
+
+        with patch('orchestrator_batch.time.sleep'):
+            with pytest.raises(RuntimeError, match="expired"):
+                orchestrator.run_batch_offline(["AI"])
+
+    def test_missing_results_raise(self, orchestrator, client):
+        """Test that requests absent from the output file are reported."""
+        client.files.content = Mock(return_value=output_file("research", ["R0"]))
+
+        with patch('orchestrator_batch.time.sleep'):
+            with pytest.raises(RuntimeError, match=r"\[1\]"):
+                orchestrator.run_batch_offline(["AI", "ML"])
+
+    def test_inherits_save_results(self, orchestrator):
+        """Test that batch results are saved with the standard report writer."""
+        assert BatchOrchestrator.save_results is MultiAgentOrchestrator.save_results
@@ -0,0 +1,168 @@
+import asyncio
+import numpy as np
+import pytest
+import threading
+from unittest.mock import AsyncMock, Mock
+import semantic_cache
+from semantic_cache import SemanticCache
+
+
+# Topics that should be treated as paraphrases share a vector; the others are
+# orthogonal to everything.
+VECTORS = {
+    "machine learning": [1.0, 0.0, 0.0],
+    "ML": [0.95, 0.05, 0.0],
+    "cooking": [0.0, 1.0, 0.0],
+    "gardening": [0.0, 0.0, 1.0],
+}
+
+
+def fake_embed(text):
+    return np.array(VECTORS[text], dtype=np.float32)
+
+
+class TestSemanticCache:
+    """Test suite for SemanticCache class."""
+
+    @pytest.fixture
+    def embed(self):
+        """Create a spy around the fake embedder."""
+        return Mock(side_effect=fake_embed)
+
+    @pytest.fixture
+    def cache(self, embed):
+        """Create a SemanticCache with a deterministic embedder."""
+        return SemanticCache(embed=embed)
+
+    def test_miss_on_empty_cache(self, cache):
+        """Test that an empty cache returns None."""
+        assert cache.get(("research", "machine learning"), "prompt") is None
+
+    def test_exact_prompt_hit_skips_embedding(self, cache, embed):
+        """Test that a repeated prompt is served without embedding the topic."""
+        cache.put(("research", "machine learning"), "prompt", "cached")
+        embed.reset_mock()
+
+        assert cache.get(("research", "machine learning"), "prompt") == "cached"
+        embed.assert_not_called()
+
+    def test_paraphrased_topic_hits(self, cache):
+        """Test that a topic above the similarity threshold is a hit."""
+        cache.put(("research", "machine learning"), "prompt 1", "cached")
+
+        assert cache.get(("research", "ML"), "prompt 2") == "cached"
+
+    def test_dissimilar_topic_misses(self, cache):
+        """Test that an unrelated topic is a miss."""
+        cache.put(("research", "machine learning"), "prompt 1", "cached")
+
+        assert cache.get(("research", "cooking"), "prompt 2") is None
+
+    def test_entries_are_scoped_by_agent(self, cache):
+        """Test that one agent never receives another agent's response."""
+        cache.put(("research", "machine learning"), "prompt 1", "research output")
+
+        assert cache.get(("analysis", "machine learning"), "prompt 2") is None
+
+    def test_evicts_least_recently_used(self, embed):
+        """Test that the least recently used entry is evicted at capacity."""
+        cache = SemanticCache(maxsize=2, embed=embed)
+        cache.put(("research", "machine learning"), "p1", "ml")
+        cache.put(("research", "cooking"), "p2", "cooking")
+        cache.get(("research", "machine learning"), "other prompt")
+
+        cache.put(("research", "gardening"), "p3", "gardening")
+
+        assert len(cache) == 2
+        assert cache.get(("research", "cooking"), "other prompt") is None
+        assert cache.get(("research", "machine learning"), "other prompt") == "ml"
+        assert cache.get(("research", "gardening"), "other prompt") == "gardening"
+
+    def test_grows_past_initial_capacity(self):
+        """Test that entries survive the embedding matrix being reallocated."""
+        def embed(text):
+            v = np.zeros(64, dtype=np.float32)
+            v[int(text)] = 1.0
+            return v
+
+        cache = SemanticCache(maxsize=64, embed=embed)
+        for i in range(40):
+            cache.put(("research", str(i)), f"p{i}", f"value {i}")
+
+        assert len(cache) == 40
+        assert cache._E_i8.dtype == np.int8
+        assert all(cache.get(("research", str(i)), "other") == f"value {i}" for i in range(40))
+
+    def test_evicted_slot_is_reused(self, embed):
+        """Test that eviction overwrites a row instead of reallocating."""
+        cache = SemanticCache(maxsize=2, embed=embed)
+        cache.put(("research", "machine learning"), "p1", "ml")
+        cache.put(("research", "cooking"), "p2", "cooking")
+        matrix = cache._E_i8
+
+        cache.put(("research", "gardening"), "p3", "gardening")
+
+        assert cache._E_i8 is matrix
+        assert cache.get(("research", "machine learning"), "other prompt") is None
+
+    def test_quantized_similarity_matches_float_cosine(self):
+        """Test that int8 similarity stays close to exact float cosine."""
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((50, 384)).astype(np.float32)
+        cache = SemanticCache(embed=lambda text: vectors[int(text)])
+        for i in range(49):
+            cache.put(("research", str(i)), f"p{i}", f"value {i}")
+
+        unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        exact = unit[:49] @ unit[49]
+        q_i8, q_scale = semantic_cache._quantize(cache._query("49"))
+        approx = (np.matmul(cache._E_i8[:49], q_i8, dtype=np.int32).astype(np.float32)
+                  * cache._scale[:49] * q_scale / (127 * 127))
+
+        assert np.abs(approx - exact).max() < 0.02
+
+    def test_get_or_compute_only_computes_on_miss(self, cache):
+        """Test that compute runs once and later calls are served from cache."""
+        compute = Mock(return_value="fresh")
+
+        first = cache.get_or_compute(("research", "machine learning"), "p", compute)
+        second = cache.get_or_compute(("research", "ML"), "p2", compute)
+
+        assert first == second == "fresh"
+        compute.assert_called_once()
+
+    def test_aget_or_compute_only_computes_on_miss(self, cache):
+        """Test the async variant awaits compute only on a miss."""
+        compute = AsyncMock(return_value="fresh")
+
+        async def run():
+            await cache.aget_or_compute(("research", "machine learning"), "p", compute)
+            return await cache.aget_or_compute(("research", "machine learning"), "p", compute)
+
+        assert asyncio.run(run()) == "fresh"
+        compute.assert_awaited_once()
+
+    def test_get_or_compute_embeds_once_per_miss(self, cache, embed):
+        """Test that a miss reuses one embedding for the lookup and the insert."""
+        cache.put(("research", "cooking"), "p0", "cooking")
+        embed.reset_mock()
+
+        cache.get_or_compute(("research", "machine learning"), "p", Mock(return_value="fresh"))
+
+        embed.assert_called_once_with("machine learning")
+
+    def test_aget_or_compute_embeds_off_the_event_loop(self):
+        """Test that the async variant embeds once, on a worker thread."""
+        threads = []
+
+        def embed(text):
+            threads.append(threading.current_thread())
+            return fake_embed(text)
+
+        cache = SemanticCache(embed=embed)
+        compute = AsyncMock(return_value="fresh")
+
+        asyncio.run(cache.aget_or_compute(("research", "machine learning"), "p", compute))
+
+        assert len(threads) == 1
+        assert threads[0] is not threading.main_thread()